@@ -1,6 +1,8 @@
 import nltk
 from nltk.stem import PorterStemmer, SnowballStemmer
 from nltk.stem import WordNetLemmatizer
+import os
+import sys
 
 from nltk.tokenize import (
     WhitespaceTokenizer,
@@ -10,6 +12,10 @@ from nltk.tokenize import (
     MWETokenizer
 )
 
+# Shared modules live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from normalization import NormalizationCache
+
 # Download required NLTK data
 nltk.download('punkt')
 nltk.download('wordnet')
@@ -63,7 +69,8 @@ sample_words = ['working', 'works', 'worked', 'running', 'runs', 'easily', 'fair
 # 6. Porter Stemmer
 print("6. PORTER STEMMER:")
 porter = PorterStemmer()
-porter_stems = [porter.stem(word) for word in sample_words]
+porter_stem = NormalizationCache(porter.stem)
+porter_stems = [porter_stem(word) for word in sample_words]
 print(f"Original: {sample_words}")
 print(f"Stemmed:  {porter_stems}")
 print("\n" + "="*80 + "\n")
@@ -71,7 +78,8 @@ print("\n" + "="*80 + "\n")
 # 7. Snowball Stemmer
 print("7. SNOWBALL STEMMER:")
 snowball = SnowballStemmer('english')
-snowball_stems = [snowball.stem(word) for word in sample_words]
+snowball_stem = NormalizationCache(snowball.stem)
+snowball_stems = [snowball_stem(word) for word in sample_words]
 print(f"Original: {sample_words}")
 print(f"Stemmed:  {snowball_stems}")
 print("\n" + "="*80 + "\n")
@@ -79,8 +87,9 @@ print("\n" + "="*80 + "\n")
 # LEMMATIZATION
 print("8. LEMMATIZATION (WordNet):")
 lemmatizer = WordNetLemmatizer()
+lemmatize = NormalizationCache(lemmatizer.lemmatize)
 sample_lemma_words = ['running', 'ran', 'runs', 'better', 'best', 'geese', 'feet']
-lemmas = [lemmatizer.lemmatize(word, pos='v') if word in ['running', 'ran', 'runs'] 
-          else lemmatizer.lemmatize(word) for word in sample_lemma_words]
+lemmas = [lemmatize(word, pos='v') if word in ['running', 'ran', 'runs'] 
+          else lemmatize(word) for word in sample_lemma_words]
 print(f"Original:   {sample_lemma_words}")
 print(f"Lemmatized: {lemmas}")
\ No newline at end of file
@@ -1,7 +1,18 @@
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from gensim.models import Word2Vec
 import pandas as pd
+import os
+import sys
+import tempfile
+
+# Shared modules live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from streaming_features import StreamingTfidfVectorizer, iter_chunks, normalize_rows, write_rows
+from document_embeddings import DocumentEmbedder, idf_weights
+from similarity_index import IVFIndex
+from streaming_corpus import ShardedCorpus, train_word2vec, write_shards
 
 # Sample data
 documents = [
@@ -22,15 +33,12 @@ print()
 
 # 2. Bag of Words - Normalized Count Occurrence
 print("=== Bag of Words - Normalized Count ===")
-normalized_vectorizer = CountVectorizer(binary=False)
+normalized_vectorizer = CountVectorizer(binary=False, dtype=np.float64)
 bow_normalized = normalized_vectorizer.fit_transform(documents)
-# Normalize by dividing each row by its sum
-bow_normalized_array = bow_normalized.toarray()
-row_sums = bow_normalized_array.sum(axis=1, keepdims=True)
-bow_normalized_array = bow_normalized_array / row_sums
-bow_norm_df = pd.DataFrame(bow_normalized_array,
-                           columns=normalized_vectorizer.get_feature_names_out())
-print(bow_norm_df)
+# Normalize by dividing each row by its sum, in place on the sparse matrix
+normalize_rows(bow_normalized, norm='l1')
+# One line per document with its nonzero terms, written a chunk of rows at a time
+write_rows(bow_normalized, sys.stdout, normalized_vectorizer.get_feature_names_out())
 print()
 
 # 3. TF-IDF
@@ -58,6 +66,16 @@ w2v_model = Word2Vec(sentences=tokenized_docs,
 print("Vocabulary:", list(w2v_model.wv.key_to_index.keys()))
 print()
 
+# Streaming mode: the documents are written to sharded files and trained from disk,
+# one checkpointed epoch at a time, without a tokenized copy of the corpus in memory
+with tempfile.TemporaryDirectory() as corpus_dir:
+    write_shards(documents, os.path.join(corpus_dir, 'corpus'), n_shards=2)
+    streamed_model, history = train_word2vec(ShardedCorpus(os.path.join(corpus_dir, 'corpus')),
+                                             os.path.join(corpus_dir, 'checkpoint'),
+                                             epochs=5, vector_size=100, window=5, min_count=1)
+print("Streamed vocabulary:", list(streamed_model.wv.key_to_index.keys()))
+print()
+
 # Example: Get embedding for a word
 word = "document"
 if word in w2v_model.wv:
@@ -77,4 +95,46 @@ def get_document_embedding(doc, model):
 print("Document embeddings (averaged word vectors):")
 for i, doc in enumerate(documents):
     doc_embedding = get_document_embedding(doc, w2v_model)
-    print(f"Document {i+1} embedding shape: {doc_embedding.shape}")
\ No newline at end of file
+    print(f"Document {i+1} embedding shape: {doc_embedding.shape}")
+print()
+
+# Batched: all documents are mapped to word ids once and averaged with one sparse x dense product
+document_embedder = DocumentEmbedder(w2v_model.wv)
+document_embeddings = document_embedder.embed(documents)
+print("Batched document embeddings:", document_embeddings.shape, document_embeddings.dtype)
+print("Max difference from the loop:",
+      np.abs(document_embeddings - [get_document_embedding(doc, w2v_model) for doc in documents]).max())
+# TF-IDF-weighted mean of the word vectors
+weighted_embedder = DocumentEmbedder(w2v_model.wv, weights=idf_weights(w2v_model.wv, tfidf_vectorizer))
+weighted_embeddings = weighted_embedder.embed(documents)
+print("TF-IDF-weighted document embeddings:", weighted_embeddings.shape)
+print()
+
+# Nearest neighbours through an inverted-file index instead of a brute-force scan
+print("=== Similarity Search (IVF index) ===")
+word_index = IVFIndex.build(w2v_model.wv.vectors)
+ids, scores = word_index.search(w2v_model.wv[word], k=3)
+print(f"Words closest to '{word}':",
+      [(w2v_model.wv.index_to_key[i], round(float(score), 3)) for i, score in zip(ids[0], scores[0])])
+# Index the first documents, then insert the last one incrementally
+document_index = IVFIndex.build(document_embeddings[:-1])
+document_index.add(document_embeddings[-1:])
+ids, scores = document_index.search(document_embeddings, k=2)
+for i, (neighbours, similarities) in enumerate(zip(ids, scores)):
+    print(f"Document {i+1} neighbours:", [(int(j) + 1, round(float(s), 3)) for j, s in zip(neighbours, similarities)])
+print()
+
+# 5. Streaming TF-IDF with feature hashing
+print("=== Streaming TF-IDF (hashed features) ===")
+# Document frequencies are accumulated chunk by chunk and the IDF weights are
+# applied in a second pass, so no vocabulary or full corpus is held in memory
+streaming_vectorizer = StreamingTfidfVectorizer(dtype=np.float64)
+for chunk in iter_chunks(documents, 2):
+    streaming_vectorizer.partial_fit(chunk)
+streaming_tfidf = sparse.vstack(list(streaming_vectorizer.transform_iter(iter_chunks(documents, 2))))
+# Compare on the hashed columns of the TF-IDF vocabulary
+hashed_columns = streaming_vectorizer.columns(tfidf_vectorizer.get_feature_names_out())
+streaming_df = pd.DataFrame(streaming_tfidf[:, hashed_columns].toarray(),
+                            columns=tfidf_vectorizer.get_feature_names_out())
+print(streaming_df)
+print("Max difference from TF-IDF:", np.abs(streaming_df.values - tfidf_matrix.toarray()).max())
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Documents/sec of the batched DocumentEmbedder against the per-document
+get_document_embedding loop of assign2.py, on a Zipf-distributed synthetic
+corpus with a Word2Vec model trained on it.
+
+Usage: python bench_embeddings.py [n_documents]
+"""
+
+import itertools
+import random
+import sys
+import time
+
+import numpy as np
+from gensim.models import Word2Vec
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from document_embeddings import DocumentEmbedder, idf_weights
+
+
+def make_documents(n_documents, n_types=50_000, exponent=1.07, seed=0):
+    """Documents of 5-60 words drawn from a Zipf distribution over made-up word types"""
+    rng = random.Random(seed)
+    vocab = [f'word{rank}' for rank in range(n_types)]
+    weights = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, n_types + 1)))
+    return [' '.join(rng.choices(vocab, cum_weights=weights, k=rng.randint(5, 60))) for _ in range(n_documents)]
+
+
+def get_document_embedding(doc, model):
+    """assign2's per-document averaging"""
+    words = doc.lower().split()
+    word_vectors = [model.wv[word] for word in words if word in model.wv]
+    if len(word_vectors) > 0:
+        return np.mean(word_vectors, axis=0)
+    else:
+        return np.zeros(model.wv.vector_size)
+
+
+def bench_embeddings(n_documents=200_000, vector_size=100, batch_size=10_000):
+    documents = make_documents(n_documents)
+    # min_count=5 leaves part of the long tail out of the vocabulary, as in real corpora
+    model = Word2Vec(sentences=[doc.split() for doc in documents], vector_size=vector_size,
+                     window=5, min_count=5, workers=4, epochs=1)
+    print(f"{n_documents} documents, {len(model.wv)} words in the vocabulary, {vector_size} dimensions")
+
+    start = time.perf_counter()
+    expected = np.array([get_document_embedding(doc, model) for doc in documents])
+    loop_speed = n_documents / (time.perf_counter() - start)
+    print(f"get_document_embedding loop  {loop_speed:10.0f} docs/s")
+
+    embedder = DocumentEmbedder(model.wv)
+    out = np.empty((n_documents, vector_size), dtype=np.float32)
+    start = time.perf_counter()
+    embedder.embed(documents, out=out, batch_size=batch_size)
+    speed = n_documents / (time.perf_counter() - start)
+    print(f"DocumentEmbedder.embed       {speed:10.0f} docs/s  x{speed / loop_speed:4.1f}  "
+          f"max difference {np.abs(out - expected).max():.1e}")
+
+    ids = embedder.encode(documents[:batch_size])
+    start = time.perf_counter()
+    for _ in range(10):
+        embedder.embed_ids(ids, out=out[:batch_size])
+    speed = 10 * batch_size / (time.perf_counter() - start)
+    print(f"  embed_ids (pre-encoded)    {speed:10.0f} docs/s")
+
+    weighted = DocumentEmbedder(model.wv, weights=idf_weights(model.wv, TfidfVectorizer().fit(documents)))
+    start = time.perf_counter()
+    weighted.embed(documents, out=out, batch_size=batch_size)
+    speed = n_documents / (time.perf_counter() - start)
+    print(f"TF-IDF weighted              {speed:10.0f} docs/s")
+
+
+if __name__ == "__main__":
+    bench_embeddings(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
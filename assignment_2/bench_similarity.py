@@ -0,0 +1,76 @@
+"""
+Recall@10 and queries/sec of IVFIndex against exact cosine search, on
+synthetic clustered embeddings shaped like Word2Vec vectors.
+
+Usage: python bench_similarity.py [n_vectors]
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from similarity_index import IVFIndex, exact_search
+
+
+def make_embeddings(n_vectors, dim=100, n_clusters=500, spread=0.7, seed=0):
+    """Vectors scattered around random cluster centres, as related words cluster in embedding space"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(n_clusters, dim))
+    vectors = centres[rng.integers(0, n_clusters, n_vectors)] + rng.normal(scale=spread, size=(n_vectors, dim))
+    return vectors.astype(np.float32)
+
+
+def recall_at_k(found, expected):
+    return np.mean([len(set(row) & set(truth)) / len(truth) for row, truth in zip(found, expected)])
+
+
+def bench_similarity(n_vectors=200_000, n_queries=1_000, k=10):
+    vectors = make_embeddings(n_vectors)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(n_vectors, n_queries, replace=False)]
+    queries = queries + rng.normal(scale=0.1, size=queries.shape).astype(np.float32)
+
+    start = time.perf_counter()
+    expected, _ = exact_search(vectors, queries, k)
+    exact_qps = n_queries / (time.perf_counter() - start)
+    print(f"{n_vectors} vectors, {n_queries} queries, k={k}")
+    print(f"exact search                   {exact_qps:9.0f} queries/s")
+
+    start = time.perf_counter()
+    index = IVFIndex.build(vectors)
+    print(f"IVF build: {index.n_lists} lists in {time.perf_counter() - start:.1f}s")
+    for n_probe in (1, 2, 4, 8, 16, 32):
+        start = time.perf_counter()
+        found, _ = index.search(queries, k, n_probe=n_probe)
+        qps = n_queries / (time.perf_counter() - start)
+        print(f"n_probe {n_probe:<3} batch  recall@{k} {recall_at_k(found, expected):.3f}  "
+              f"{qps:9.0f} queries/s  x{qps / exact_qps:5.1f}")
+    start = time.perf_counter()
+    for query in queries[:200]:
+        index.search(query, k)
+    print(f"n_probe {index.n_probe:<3} one query at a time     {200 / (time.perf_counter() - start):9.0f} queries/s")
+
+    # Half built up front, the rest inserted in batches of 1,000
+    incremental = IVFIndex.build(vectors[:n_vectors // 2])
+    start = time.perf_counter()
+    for offset in range(n_vectors // 2, n_vectors, 1_000):
+        incremental.add(vectors[offset:offset + 1_000])
+    inserts = (n_vectors - n_vectors // 2) / (time.perf_counter() - start)
+    found, _ = incremental.search(queries, k)
+    print(f"incremental inserts            {inserts:9.0f} vectors/s  recall@{k} {recall_at_k(found, expected):.3f}")
+
+    with tempfile.TemporaryDirectory() as path:
+        index.save(path)
+        start = time.perf_counter()
+        mapped = IVFIndex.load(path)
+        load_time = time.perf_counter() - start
+        found, _ = mapped.search(queries, k)
+        # Release the memory-mapped arrays before their files are removed
+        del mapped
+    print(f"mmap load in {load_time * 1000:.1f}ms, recall@{k} {recall_at_k(found, expected):.3f}")
+
+
+if __name__ == "__main__":
+    bench_similarity(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
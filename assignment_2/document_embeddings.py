@@ -0,0 +1,126 @@
+"""
+Batched document embeddings from Word2Vec word vectors.
+
+Instead of looking up and averaging the vectors of one document at a time,
+DocumentEmbedder maps a batch of documents to a padded array of word ids
+once, turns it into a sparse documents x vocabulary weight matrix and
+computes every embedding of the batch with one sparse x dense product,
+written into a preallocated float32 array.
+
+With uniform weights an embedding is the mean of the document's in-vocabulary
+word vectors, the same as get_document_embedding in assign2.py; with
+idf_weights it is the TF-IDF-weighted mean.
+
+Usage:
+    embedder = DocumentEmbedder(w2v_model.wv)
+    embeddings = embedder.embed(documents)                  # (n_documents, vector_size)
+    weighted = DocumentEmbedder(w2v_model.wv, weights=idf_weights(w2v_model.wv, tfidf_vectorizer))
+"""
+
+import itertools
+import os
+import sys
+
+import numpy as np
+from scipy import sparse
+
+# Shared modules live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from streaming_features import normalize_rows
+
+PAD = -1
+
+
+class _Lookup(dict):
+    # Word -> id mapping that answers PAD for unknown words without a Python-level get per token
+    def __missing__(self, word):
+        return PAD
+
+
+def idf_weights(keyed_vectors, tfidf_vectorizer, default=1.0):
+    """
+    Per-word weights aligned with keyed_vectors.index_to_key, from a fitted TfidfVectorizer
+
+    Words the vectorizer has no idf for (e.g. single letters, which its
+    default token pattern skips) get `default`; 1.0 is the idf of a word
+    that occurs in every document.
+    """
+    vocabulary = tfidf_vectorizer.vocabulary_
+    idf = tfidf_vectorizer.idf_
+    return np.array([idf[vocabulary[word]] if word in vocabulary else default
+                     for word in keyed_vectors.index_to_key], dtype=np.float32)
+
+
+class DocumentEmbedder:
+    """
+    Mean or weighted-mean document embeddings, a batch of documents per matrix product
+
+    Args:
+        keyed_vectors: Trained word vectors (Word2Vec.wv)
+        weights: Optional weight per word id, e.g. from idf_weights; uniform if None
+        tokenize: Function from document to words; default lower() then split()
+        dtype: Dtype of the embeddings
+    """
+
+    def __init__(self, keyed_vectors, weights=None, tokenize=None, dtype=np.float32):
+        self.vectors = np.asarray(keyed_vectors.vectors, dtype=dtype)
+        self.lookup = _Lookup(keyed_vectors.key_to_index)
+        self.weights = None if weights is None else np.asarray(weights, dtype=dtype)
+        self.tokenize = tokenize or (lambda document: document.lower().split())
+        self.dtype = dtype
+
+    @property
+    def vector_size(self):
+        return self.vectors.shape[1]
+
+    def encode(self, documents):
+        """
+        Word ids of each document as one padded int32 array
+
+        Returns an (n_documents, longest document) array; out-of-vocabulary
+        words and padding are PAD.
+        """
+        token_lists = [self.tokenize(document) for document in documents]
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        flat = np.fromiter(map(self.lookup.__getitem__, itertools.chain.from_iterable(token_lists)),
+                           dtype=np.int32, count=int(lengths.sum()))
+        ids = np.full((len(token_lists), int(lengths.max(initial=0))), PAD, dtype=np.int32)
+        ids[np.arange(ids.shape[1]) < lengths[:, None]] = flat
+        return ids
+
+    def weight_matrix(self, ids):
+        """Sparse (n_documents, vocabulary) matrix whose rows average the word vectors of each document"""
+        rows, positions = np.nonzero(ids != PAD)
+        columns = ids[rows, positions]
+        values = np.ones(len(columns), dtype=self.dtype) if self.weights is None else self.weights[columns]
+        # Duplicate (row, column) pairs are summed, so repeated words count once per occurrence
+        matrix = sparse.csr_matrix((values, (rows, columns)), shape=(ids.shape[0], len(self.vectors)),
+                                   dtype=self.dtype)
+        # Documents without known words keep an all-zero row and a zero embedding
+        return normalize_rows(matrix, norm='l1')
+
+    def embed_ids(self, ids, out=None):
+        """Embeddings of already encoded documents, written into `out` if given"""
+        if out is None:
+            out = np.empty((ids.shape[0], self.vector_size), dtype=self.dtype)
+        out[:] = self.weight_matrix(ids) @ self.vectors
+        return out
+
+    def embed(self, documents, out=None, batch_size=10_000):
+        """
+        Embeddings of a sequence of documents, one batch of `batch_size` at a time
+
+        Args:
+            documents: Sequence of document strings
+            out: Preallocated (len(documents), vector_size) array to fill
+            batch_size: Documents encoded and multiplied at once; bounds the padded id array
+
+        Returns:
+            np.ndarray: `out`, or a new float32 array
+        """
+        if out is None:
+            out = np.empty((len(documents), self.vector_size), dtype=self.dtype)
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start:start + batch_size]
+            self.embed_ids(self.encode(batch), out=out[start:start + len(batch)])
+        return out
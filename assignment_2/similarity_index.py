@@ -0,0 +1,256 @@
+"""
+Approximate nearest-neighbour search by cosine similarity over word vectors
+and document embeddings, in NumPy.
+
+IVFIndex is an inverted-file index: spherical k-means splits the unit-length
+vectors into `n_lists` clusters, each vector is stored with its cluster, and
+a query only scores the vectors of the `n_probe` clusters whose centroids
+are closest to it. The vectors are kept sorted by cluster with an offsets
+array, so a cluster is one contiguous slice and a saved index can be
+memory-mapped. Vectors added after that go to a small buffer that is
+searched exactly and merged into the lists once it grows.
+
+Usage:
+    index = IVFIndex.build(w2v_model.wv.vectors)
+    ids, scores = index.search(w2v_model.wv[['document', 'first']], k=10)
+    index.add(new_vectors)
+    index.save('word_index'); index = IVFIndex.load('word_index')
+"""
+
+import json
+import os
+
+import numpy as np
+
+FORMAT_VERSION = 1
+ARRAYS = ('centroids', 'vectors', 'ids', 'offsets')
+
+
+def unit_rows(vectors, dtype=np.float32):
+    """Rows scaled to unit length; all-zero rows stay zero"""
+    vectors = np.array(vectors, dtype=dtype, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    vectors /= norms
+    return vectors
+
+
+def _top_k(scores, k):
+    # Column indices of the k largest scores of each row, unordered
+    if scores.shape[1] <= k:
+        return np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+
+def _sorted(ids, scores):
+    order = np.argsort(-scores, axis=1, kind='stable')
+    return np.take_along_axis(ids, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def exact_search(vectors, queries, k=10, batch_size=1024):
+    """
+    Brute-force cosine search: the row numbers and similarities of the k nearest vectors of each query
+
+    Returns two (n_queries, k) arrays sorted by decreasing similarity.
+    """
+    vectors, queries = unit_rows(vectors), unit_rows(queries)
+    k = min(k, len(vectors))
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    scores = np.empty((len(queries), k), dtype=np.float32)
+    for start in range(0, len(queries), batch_size):
+        block = queries[start:start + batch_size] @ vectors.T
+        top = _top_k(block, k)
+        ids[start:start + len(block)], scores[start:start + len(block)] = _sorted(
+            top, np.take_along_axis(block, top, axis=1))
+    return ids, scores
+
+
+class IVFIndex:
+    """
+    Inverted-file cosine index
+
+    Args:
+        centroids: (n_lists, dim) unit-length cluster centroids, e.g. from train_centroids
+        n_probe: Clusters scanned per query by default; more is slower and more accurate
+        max_buffer: Added vectors kept in the exact-search buffer before it is merged
+    """
+
+    def __init__(self, centroids, n_probe=8, max_buffer=4096):
+        self.centroids = unit_rows(centroids)
+        self.n_probe = n_probe
+        self.max_buffer = max_buffer
+        dim = self.centroids.shape[1]
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.offsets = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+        self._buffer_vectors = []
+        self._buffer_ids = []
+        self._next_id = 0
+
+    @property
+    def dim(self):
+        return self.centroids.shape[1]
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    def __len__(self):
+        return len(self.ids) + sum(map(len, self._buffer_ids))
+
+    @staticmethod
+    def train_centroids(vectors, n_lists, n_iter=20, sample_size=None, seed=0):
+        """
+        Spherical k-means centroids of (a sample of) `vectors`
+
+        Starts from randomly chosen vectors; clusters that end up empty are
+        reseeded with random sample vectors.
+        """
+        rng = np.random.default_rng(seed)
+        vectors = np.asarray(vectors)
+        sample_size = sample_size or 64 * n_lists
+        if len(vectors) > sample_size:
+            vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        sample = unit_rows(vectors)
+        n_lists = min(n_lists, len(sample))
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+        for _ in range(n_iter):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind='stable')
+            counts = np.bincount(assignment, minlength=n_lists)
+            filled = counts > 0
+            sums = np.add.reduceat(sample[order], np.concatenate(([0], np.cumsum(counts)[:-1]))[filled])
+            centroids[filled] = unit_rows(sums)
+            if not filled.all():
+                centroids[~filled] = sample[rng.choice(len(sample), int((~filled).sum()), replace=False)]
+        return centroids
+
+    @classmethod
+    def build(cls, vectors, n_lists=None, n_probe=8, ids=None, **train_kwargs):
+        """Train centroids on `vectors` and index them; n_lists defaults to about 4 * sqrt(len(vectors))"""
+        n_lists = n_lists or max(1, int(4 * np.sqrt(len(vectors))))
+        index = cls(cls.train_centroids(vectors, n_lists, **train_kwargs), n_probe=n_probe)
+        index.add(vectors, ids=ids)
+        index.merge()
+        return index
+
+    def assign(self, vectors):
+        """Cluster of each unit-length vector"""
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+
+    def add(self, vectors, ids=None):
+        """
+        Add vectors under the given ids (default: consecutive ids after the largest so far)
+
+        They are searched exactly until `max_buffer` have accumulated, then
+        merged into the inverted lists.
+        """
+        vectors = unit_rows(vectors)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+        if ids is None:
+            ids = np.arange(self._next_id, self._next_id + len(vectors), dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) != len(vectors):
+            raise ValueError(f"{len(ids)} ids for {len(vectors)} vectors")
+        if len(ids):
+            self._next_id = max(self._next_id, int(ids.max()) + 1)
+        self._buffer_vectors.append(vectors)
+        self._buffer_ids.append(ids)
+        if sum(map(len, self._buffer_ids)) >= self.max_buffer:
+            self.merge()
+        return ids
+
+    def merge(self):
+        """Move the buffered vectors into the inverted lists"""
+        if not self._buffer_ids:
+            return
+        new_vectors = np.concatenate(self._buffer_vectors)
+        new_ids = np.concatenate(self._buffer_ids)
+        lists = np.concatenate((np.repeat(np.arange(self.n_lists), np.diff(self.offsets)),
+                                self.assign(new_vectors)))
+        order = np.argsort(lists, kind='stable')
+        self.vectors = np.concatenate((self.vectors, new_vectors))[order]
+        self.ids = np.concatenate((self.ids, new_ids))[order]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(lists, minlength=self.n_lists))))
+        self._buffer_vectors, self._buffer_ids = [], []
+
+    def search(self, queries, k=10, n_probe=None):
+        """
+        Approximate k nearest neighbours by cosine similarity, for a batch of queries
+
+        Returns (ids, scores), two (n_queries, k) arrays sorted by decreasing
+        similarity; missing neighbours have id -1 and score -inf.
+        """
+        queries = unit_rows(queries)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        best_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+
+        def update(rows, candidate_ids, candidate_scores):
+            top = _top_k(candidate_scores, k)
+            ids = np.concatenate((best_ids[rows], np.take_along_axis(candidate_ids, top, axis=1)), axis=1)
+            scores = np.concatenate((best_scores[rows], np.take_along_axis(candidate_scores, top, axis=1)), axis=1)
+            keep = _top_k(scores, k)
+            best_ids[rows] = np.take_along_axis(ids, keep, axis=1)
+            best_scores[rows] = np.take_along_axis(scores, keep, axis=1)
+
+        # Group the (query, cluster) pairs by cluster, so each probed cluster is scored
+        # against all of its queries with one matrix product
+        probes = _top_k(queries @ self.centroids.T, n_probe)
+        pairs = np.argsort(probes, axis=None, kind='stable')
+        lists = probes.ravel()[pairs]
+        rows = pairs // n_probe
+        bounds = np.flatnonzero(np.diff(lists)) + 1
+        for group in np.split(np.arange(len(lists)), bounds):
+            if not len(group):
+                continue
+            cluster = lists[group[0]]
+            lo, hi = self.offsets[cluster], self.offsets[cluster + 1]
+            if lo == hi:
+                continue
+            group_rows = rows[group]
+            scores = queries[group_rows] @ self.vectors[lo:hi].T
+            update(group_rows, np.broadcast_to(self.ids[lo:hi], scores.shape), scores)
+
+        for vectors, ids in zip(self._buffer_vectors, self._buffer_ids):
+            scores = queries @ vectors.T
+            update(np.arange(len(queries)), np.broadcast_to(ids, scores.shape), scores)
+        return _sorted(best_ids, best_scores)
+
+    def save(self, path):
+        """Write the index to directory `path` (merging buffered vectors first)"""
+        self.merge()
+        os.makedirs(path, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+        meta = {'format_version': FORMAT_VERSION, 'dim': self.dim, 'n_lists': self.n_lists,
+                'size': len(self.ids), 'n_probe': self.n_probe, 'max_buffer': self.max_buffer,
+                'next_id': self._next_id}
+        # Written last, so a directory without it is an interrupted save
+        with open(os.path.join(path, 'index.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Open a saved index; with mmap=True the vectors stay on disk and only probed clusters are read
+
+        Vectors added later are buffered in memory; merging them makes an
+        in-memory copy of the lists.
+        """
+        with open(os.path.join(path, 'index.json')) as f:
+            meta = json.load(f)
+        if meta.get('format_version', 0) > FORMAT_VERSION:
+            raise ValueError(f"{path} holds index format v{meta.get('format_version')}, "
+                             f"expected v{FORMAT_VERSION} or older")
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None)
+                  for name in ARRAYS}
+        index = cls.__new__(cls)
+        index.centroids = np.asarray(arrays['centroids'])
+        index.vectors, index.ids, index.offsets = arrays['vectors'], arrays['ids'], arrays['offsets']
+        index.n_probe = meta['n_probe']
+        index.max_buffer = meta['max_buffer']
+        index._buffer_vectors, index._buffer_ids = [], []
+        index._next_id = meta['next_id']
+        return index
@@ -0,0 +1,153 @@
+"""
+File-backed Word2Vec training that does not hold the corpus in memory.
+
+ShardedCorpus streams tokenized sentences from a set of text files (one
+sentence or document per line), through the project's TextNormalizer, and
+starts over on every iteration, so gensim can make as many passes as it
+needs. train_word2vec builds the vocabulary in one pass, then trains one
+epoch at a time with all worker threads, printing words/sec for each epoch
+and checkpointing the model after it; rerunning it with the same
+checkpoint directory resumes after the last completed epoch.
+
+Usage:
+    corpus = ShardedCorpus('corpus/*.txt')
+    model, history = train_word2vec(corpus, 'w2v_checkpoint', epochs=5, vector_size=100, min_count=5)
+"""
+
+import glob
+import json
+import os
+import shutil
+import sys
+import time
+
+from gensim.models import Word2Vec
+
+# Shared modules live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from normalization import TextNormalizer
+
+# gensim's worker threads silently truncate longer sentences
+MAX_SENTENCE_LENGTH = 10_000
+
+
+def write_shards(documents, directory, n_shards=8):
+    """Write documents round-robin into `n_shards` text files, one per line; returns their paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, f'shard-{i:05d}.txt') for i in range(n_shards)]
+    files = [open(path, 'w', encoding='utf-8') for path in paths]
+    try:
+        for i, document in enumerate(documents):
+            files[i % n_shards].write(' '.join(str(document).split()) + '\n')
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+class ShardedCorpus:
+    """
+    Restartable iterable of token lists read from sharded text files
+
+    Args:
+        paths: A glob pattern, a directory (all of its files) or a list of file paths
+        normalizer: Callable from line to tokens; default TextNormalizer()
+        max_sentence_length: Longer lines are split into pieces of this many tokens
+    """
+
+    def __init__(self, paths, normalizer=None, max_sentence_length=MAX_SENTENCE_LENGTH):
+        if isinstance(paths, str):
+            pattern = os.path.join(paths, '*') if os.path.isdir(paths) else paths
+            paths = glob.glob(pattern)
+        self.paths = sorted(paths)
+        if not self.paths:
+            raise FileNotFoundError(f"no corpus shards matched {paths!r}")
+        self.normalizer = normalizer or TextNormalizer()
+        self.max_sentence_length = max_sentence_length
+
+    def __iter__(self):
+        tokenize, limit = self.normalizer, self.max_sentence_length
+        for path in self.paths:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    tokens = tokenize(line)
+                    for start in range(0, len(tokens), limit):
+                        yield tokens[start:start + limit]
+
+
+def _load_checkpoint(checkpoint_dir):
+    state_path = os.path.join(checkpoint_dir, 'state.json')
+    if not os.path.exists(state_path):
+        return None, None
+    with open(state_path) as f:
+        state = json.load(f)
+    return Word2Vec.load(os.path.join(checkpoint_dir, state['model'])), state
+
+
+def _save_checkpoint(model, checkpoint_dir, state):
+    # Save under a new name, then switch state.json to it, so an interrupted
+    # save leaves the previous checkpoint intact
+    name = f"epoch-{state['epochs_done']:04d}"
+    os.makedirs(os.path.join(checkpoint_dir, name), exist_ok=True)
+    model.save(os.path.join(checkpoint_dir, name, 'word2vec.model'))
+    previous = state.get('model')
+    state['model'] = os.path.join(name, 'word2vec.model')
+    tmp_path = os.path.join(checkpoint_dir, 'state.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, os.path.join(checkpoint_dir, 'state.json'))
+    if previous and os.path.dirname(previous) != name:
+        shutil.rmtree(os.path.join(checkpoint_dir, os.path.dirname(previous)), ignore_errors=True)
+
+
+def train_word2vec(corpus, checkpoint_dir, epochs=5, workers=None, **word2vec_kwargs):
+    """
+    Train Word2Vec on a restartable corpus, one checkpointed epoch at a time
+
+    Args:
+        corpus: Restartable iterable of token lists, e.g. a ShardedCorpus
+        checkpoint_dir: Directory for checkpoints; training resumes from it if it holds one
+        epochs: Total number of epochs, including those already done
+        workers: Training threads (default: all cores)
+        **word2vec_kwargs: Word2Vec parameters (vector_size, window, min_count, sg, ...),
+            used only when starting from scratch
+
+    Returns:
+        tuple: (model, history) with one dict of words, seconds and words_per_sec per epoch run now
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    model, state = _load_checkpoint(checkpoint_dir)
+    if model is None:
+        model = Word2Vec(workers=workers or os.cpu_count() or 1, **word2vec_kwargs)
+        start = time.perf_counter()
+        model.build_vocab(corpus)
+        print(f"Vocabulary: {len(model.wv)} words from {model.corpus_count} sentences "
+              f"in {time.perf_counter() - start:.1f}s")
+        # train() overwrites model.alpha and model.min_alpha, so the schedule is kept here
+        state = {'epochs_done': 0, 'next_alpha': model.alpha, 'min_alpha': model.min_alpha, 'history': []}
+        _save_checkpoint(model, checkpoint_dir, state)
+    else:
+        print(f"Resuming from {checkpoint_dir} after epoch {state['epochs_done']}")
+        if workers:
+            model.workers = workers
+
+    history = []
+    for epoch in range(state['epochs_done'], epochs):
+        # Decay the learning rate linearly to min_alpha over the remaining epochs, as a
+        # single train() call would; a resumed run with more epochs stretches the rest
+        start_alpha, min_alpha = state['next_alpha'], state['min_alpha']
+        end_alpha = start_alpha - (start_alpha - min_alpha) / (epochs - epoch)
+        start = time.perf_counter()
+        effective_words, words = model.train(corpus, total_examples=model.corpus_count, epochs=1,
+                                             start_alpha=start_alpha, end_alpha=end_alpha)
+        seconds = time.perf_counter() - start
+        record = {'epoch': epoch + 1, 'words': words, 'effective_words': effective_words,
+                  'seconds': seconds, 'words_per_sec': words / seconds}
+        print(f"Epoch {epoch + 1}/{epochs}: {words} words ({effective_words} trained) in {seconds:.1f}s, "
+              f"{record['words_per_sec']:.0f} words/s ({model.workers} workers)")
+        history.append(record)
+        state['epochs_done'] = epoch + 1
+        state['next_alpha'] = end_alpha
+        state['history'].append(record)
+        _save_checkpoint(model, checkpoint_dir, state)
+    return model, history
@@ -5,70 +5,173 @@ from sklearn.preprocessing import LabelEncoder
 import nltk
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
-import re
-import pickle
+import functools
+import os
+import sys
+import multiprocessing as mp
+from collections import deque
 
-# Download required NLTK data
-nltk.download('stopwords')
-nltk.download('wordnet')
-nltk.download('omw-1.4')
+# Shared modules live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from normalization import NormalizationCache, TextNormalizer
+from tfidf_artifacts import save_artifacts
+from streaming_features import StreamingTfidfVectorizer
+
+# NLTK packages used here, by the path nltk.data.find looks them up under
+NLTK_DATA = {'stopwords': 'corpora/stopwords', 'wordnet': 'corpora/wordnet', 'omw-1.4': 'corpora/omw-1.4'}
+
+def ensure_nltk_data():
+    """
+    Download the NLTK data this module needs, skipping what is already installed
+
+    Call it once from the main process before any preprocessing; importing
+    the module (as every spawned pool worker does) downloads nothing.
+    """
+    for package, path in NLTK_DATA.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(package)
+
+@functools.lru_cache(maxsize=None)
+def english_stop_words():
+    """NLTK's English stop words, read on first use"""
+    return frozenset(stopwords.words('english'))
 
 # Initialize
 lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words('english'))
+lemmatize = NormalizationCache(lemmatizer.lemmatize)
+cleaner = TextNormalizer()
 
 def clean_text(text):
     """Clean text by removing special characters, numbers, and extra spaces"""
-    text = str(text).lower()
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    return ' '.join(cleaner.tokens(text))
 
 def lemmatize_text(text):
     """Lemmatize text and remove stop words"""
     words = text.split()
-    lemmatized = [lemmatizer.lemmatize(word) for word in words if word not in stop_words]
+    stop_words = english_stop_words()
+    lemmatized = [lemmatize(word) for word in words if word not in stop_words]
     return ' '.join(lemmatized)
 
-# Example: Load your data
-# df = pd.read_csv('your_data.csv')
-# For demonstration, creating sample data
-df = pd.DataFrame({
-    'text': ['This is a sample text!', 'Another example with numbers 123.', 
-             'Text preprocessing is important!!!'],
-    'label': ['positive', 'negative', 'positive']
-})
-
-# Step 1: Text Cleaning
-df['cleaned_text'] = df['text'].apply(clean_text)
-
-# Step 2: Lemmatization and Stop Words Removal
-df['processed_text'] = df['cleaned_text'].apply(lemmatize_text)
-
-# Step 3: Label Encoding
-label_encoder = LabelEncoder()
-df['encoded_label'] = label_encoder.fit_transform(df['label'])
-
-# Step 4: TF-IDF Vectorization
-tfidf_vectorizer = TfidfVectorizer(max_features=1000)
-tfidf_matrix = tfidf_vectorizer.fit_transform(df['processed_text'])
-
-# Save outputs
-df.to_csv('processed_data.csv', index=False)
-np.save('tfidf_matrix.npy', tfidf_matrix.toarray())
-
-# Save models for future use
-with open('label_encoder.pkl', 'wb') as f:
-    pickle.dump(label_encoder, f)
-
-with open('tfidf_vectorizer.pkl', 'wb') as f:
-    pickle.dump(tfidf_vectorizer, f)
-
-print("Processing complete!")
-print(f"Processed data shape: {df.shape}")
-print(f"TF-IDF matrix shape: {tfidf_matrix.shape}")
-print("\nSaved files:")
-print("- processed_data.csv")
-print("- tfidf_matrix.npy")
-print("- label_encoder.pkl")
-print("- tfidf_vectorizer.pkl")
\ No newline at end of file
+def init_worker():
+    """Pool initializer: load WordNet and the stop words once per worker, before the first chunk arrives"""
+    global lemmatizer, lemmatize
+    lemmatizer = WordNetLemmatizer()
+    lemmatize = NormalizationCache(lemmatizer.lemmatize)
+    lemmatize('warmup')
+    english_stop_words()
+
+def process_texts(texts):
+    """Clean and lemmatize a chunk of raw texts, splitting each text only once"""
+    cleaned, processed = [], []
+    stop_words = english_stop_words()
+    for text in texts:
+        words = cleaner.tokens(text)
+        cleaned.append(' '.join(words))
+        processed.append(' '.join([lemmatize(word) for word in words if word not in stop_words]))
+    return cleaned, processed
+
+def preprocess_csv(input_path, output_path, text_column='text', chunksize=100_000,
+                   processes=None, max_pending=None):
+    """
+    Stream a CSV through clean_text and lemmatize_text on a process pool
+
+    The input is read `chunksize` rows at a time and each chunk's texts go to
+    a worker; processed chunks are appended to output_path in input order as
+    soon as they are ready. At most `max_pending` chunks (default: two per
+    worker) are in flight, so memory stays bounded for any file size.
+    Returns the number of rows written.
+    """
+    ensure_nltk_data()
+    processes = processes or mp.cpu_count()
+    max_pending = max_pending or 2 * processes
+    rows = 0
+
+    def write(chunk, cleaned, processed):
+        nonlocal rows
+        chunk['cleaned_text'] = cleaned
+        chunk['processed_text'] = processed
+        chunk.to_csv(output_path, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+        rows += len(chunk)
+
+    reader = pd.read_csv(input_path, chunksize=chunksize)
+    if processes == 1:
+        for chunk in reader:
+            write(chunk, *process_texts(chunk[text_column].tolist()))
+        return rows
+
+    pending = deque()
+    with mp.Pool(processes, initializer=init_worker) as pool:
+        for chunk in reader:
+            pending.append((chunk, pool.apply_async(process_texts, (chunk[text_column].tolist(),))))
+            if len(pending) >= max_pending:
+                chunk, result = pending.popleft()
+                write(chunk, *result.get())
+        while pending:
+            chunk, result = pending.popleft()
+            write(chunk, *result.get())
+    return rows
+
+def hashed_tfidf_csv(csv_path, column='processed_text', chunksize=100_000, n_features=2 ** 20):
+    """
+    Out-of-core TF-IDF over a column of a (processed) CSV
+
+    A first pass over the file accumulates hashed document frequencies; the
+    returned generator makes the second pass, yielding one CSR block of
+    TF-IDF rows per chunk. Memory is bounded by chunksize and n_features.
+    Returns (vectorizer, blocks).
+    """
+    def chunks():
+        for chunk in pd.read_csv(csv_path, usecols=[column], chunksize=chunksize, keep_default_na=False):
+            yield chunk[column].tolist()
+
+    vectorizer = StreamingTfidfVectorizer(n_features=n_features).fit(chunks())
+    return vectorizer, vectorizer.transform_iter(chunks())
+
+
+if __name__ == "__main__":
+    ensure_nltk_data()
+
+    # Example: Load your data
+    # df = pd.read_csv('your_data.csv')
+    # For large files, stream them through a worker pool instead:
+    # preprocess_csv('your_data.csv', 'processed_data.csv')
+    # vectorizer, blocks = hashed_tfidf_csv('processed_data.csv')
+    # For demonstration, creating sample data
+    df = pd.DataFrame({
+        'text': ['This is a sample text!', 'Another example with numbers 123.', 
+                 'Text preprocessing is important!!!'],
+        'label': ['positive', 'negative', 'positive']
+    })
+
+    # Step 1: Text Cleaning
+    df['cleaned_text'] = df['text'].apply(clean_text)
+
+    # Step 2: Lemmatization and Stop Words Removal
+    df['processed_text'] = df['cleaned_text'].apply(lemmatize_text)
+
+    # Step 3: Label Encoding
+    label_encoder = LabelEncoder()
+    df['encoded_label'] = label_encoder.fit_transform(df['label'])
+
+    # Step 4: TF-IDF Vectorization
+    tfidf_vectorizer = TfidfVectorizer(max_features=1000, dtype=np.float32)
+    tfidf_matrix = tfidf_vectorizer.fit_transform(df['processed_text'])
+
+    # Save outputs
+    df.to_csv('processed_data.csv', index=False)
+
+    # Save the sparse matrix and the fitted models as a new artifact version
+    artifact_dir = save_artifacts('artifacts', tfidf_matrix, tfidf_vectorizer, label_encoder,
+                                  metadata={'source': 'processed_data.csv'})
+
+    print("Processing complete!")
+    print(f"Processed data shape: {df.shape}")
+    print(f"TF-IDF matrix shape: {tfidf_matrix.shape}")
+    print("\nSaved files:")
+    print("- processed_data.csv")
+    print(f"- {artifact_dir}/manifest.json")
+    print(f"- {artifact_dir}/data.npy, indices.npy, indptr.npy (sparse TF-IDF matrix)")
+    print(f"- {artifact_dir}/label_encoder.pkl")
+    print(f"- {artifact_dir}/tfidf_vectorizer.pkl")
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Throughput of the chunked, multi-process CSV preprocessing in assign3.py on a
+synthetic CSV, for 1 up to all available cores.
+
+Usage: python bench_preprocess.py [n_rows]
+"""
+
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from assign3 import clean_text, ensure_nltk_data, lemmatize_text, preprocess_csv
+
+WORDS = ("The customers were running late because the trains had stopped near the stations. "
+         "Studies show that 42 geese crossed the roads!!! Leaves are falling; children played "
+         "with their toys while the wolves watched. This product works better than the others.").split()
+
+
+def make_csv(path, n_rows, seed=0):
+    rng = random.Random(seed)
+    texts = [' '.join(rng.choices(WORDS, k=rng.randint(8, 40))) for _ in range(n_rows)]
+    labels = rng.choices(['positive', 'negative'], k=n_rows)
+    pd.DataFrame({'text': texts, 'label': labels}).to_csv(path, index=False)
+
+
+def bench_preprocess(n_rows=200_000, chunksize=10_000):
+    ensure_nltk_data()
+    with tempfile.TemporaryDirectory() as workdir:
+        input_path = os.path.join(workdir, 'input.csv')
+        make_csv(input_path, n_rows)
+        print(f"{n_rows} rows, chunks of {chunksize}, {mp.cpu_count()} cores")
+
+        df = pd.read_csv(input_path)
+        start = time.perf_counter()
+        expected = df['text'].apply(clean_text).apply(lemmatize_text)
+        elapsed = time.perf_counter() - start
+        print(f"DataFrame.apply       {n_rows / elapsed:10.0f} rows/s")
+
+        processes = 1
+        while True:
+            output_path = os.path.join(workdir, f'output_{processes}.csv')
+            start = time.perf_counter()
+            rows = preprocess_csv(input_path, output_path, chunksize=chunksize, processes=processes)
+            elapsed = time.perf_counter() - start
+            processed = pd.read_csv(output_path, keep_default_na=False)['processed_text']
+            assert rows == n_rows and processed.tolist() == expected.fillna('').tolist()
+            print(f"preprocess_csv x{processes:<3} {n_rows / elapsed:10.0f} rows/s")
+            if processes >= mp.cpu_count():
+                break
+            processes = min(2 * processes, mp.cpu_count())
+
+
+if __name__ == "__main__":
+    bench_preprocess(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,158 @@
+"""
+Versioned, sparse-native storage for the TF-IDF outputs of assign3.py.
+
+Each save creates a new version directory under the artifact root:
+
+    artifacts/
+        v1/
+            manifest.json
+            data.npy  indices.npy  indptr.npy    (CSR arrays, float32 values)
+            tfidf_vectorizer.pkl  label_encoder.pkl
+        v2/ ...
+
+The matrix is never densified. Loading memory-maps the arrays, so opening an
+artifact reads only the manifest, and load_rows reads just the pages that
+hold the requested rows.
+"""
+
+import json
+import os
+import pickle
+import re
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+FORMAT = 'tfidf-csr'
+FORMAT_VERSION = 1
+ARRAYS = ('data', 'indices', 'indptr')
+
+
+def list_versions(root, complete=True):
+    """Version numbers saved under root, oldest first (with complete=False, interrupted saves too)"""
+    if not os.path.isdir(root):
+        return []
+    versions = [int(match.group(1)) for match in map(re.compile(r'v(\d+)$').match, os.listdir(root)) if match]
+    if complete:
+        versions = [v for v in versions if os.path.exists(os.path.join(root, f'v{v}', 'manifest.json'))]
+    return sorted(versions)
+
+
+def resolve(path, version=None):
+    """Directory of an artifact: path itself if it holds a manifest, else a version under it (default: latest)"""
+    if version is None and os.path.exists(os.path.join(path, 'manifest.json')):
+        return path
+    versions = list_versions(path)
+    if not versions:
+        raise FileNotFoundError(f"no TF-IDF artifacts under {path}")
+    if version is None:
+        version = versions[-1]
+    elif version not in versions:
+        raise FileNotFoundError(f"no version {version} under {path} (have {versions})")
+    return os.path.join(path, f'v{version}')
+
+
+def save_artifacts(root, tfidf_matrix, tfidf_vectorizer, label_encoder, metadata=None):
+    """
+    Save a TF-IDF matrix with its fitted vectorizer and label encoder as a new version
+
+    Args:
+        root: Artifact root directory (created if needed)
+        tfidf_matrix: Sparse document-term matrix, stored as CSR with float32 values
+        tfidf_vectorizer: Fitted TfidfVectorizer, pickled alongside
+        label_encoder: Fitted LabelEncoder, pickled alongside
+        metadata: Extra JSON-serializable fields for the manifest
+
+    Returns:
+        str: The new version directory
+    """
+    matrix = csr_matrix(tfidf_matrix, dtype=np.float32)
+    matrix.sort_indices()
+    version = (list_versions(root, complete=False) or [0])[-1] + 1
+    path = os.path.join(root, f'v{version}')
+    os.makedirs(path)
+
+    # scipy wants indices and indptr in one dtype; anything else makes it copy them on load
+    index_dtype = np.int32 if max(matrix.nnz, matrix.shape[1]) < 2 ** 31 else np.int64
+    np.save(os.path.join(path, 'data.npy'), matrix.data)
+    np.save(os.path.join(path, 'indices.npy'), matrix.indices.astype(index_dtype, copy=False))
+    np.save(os.path.join(path, 'indptr.npy'), matrix.indptr.astype(index_dtype, copy=False))
+    with open(os.path.join(path, 'tfidf_vectorizer.pkl'), 'wb') as f:
+        pickle.dump(tfidf_vectorizer, f)
+    with open(os.path.join(path, 'label_encoder.pkl'), 'wb') as f:
+        pickle.dump(label_encoder, f)
+
+    manifest = {
+        'format': FORMAT,
+        'format_version': FORMAT_VERSION,
+        'version': version,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'shape': list(matrix.shape),
+        'nnz': int(matrix.nnz),
+        'dtype': 'float32',
+        'arrays': {name: f'{name}.npy' for name in ARRAYS},
+        'tfidf_vectorizer': 'tfidf_vectorizer.pkl',
+        'label_encoder': 'label_encoder.pkl',
+        'metadata': metadata or {},
+    }
+    # The manifest goes last, so a version directory without one is an interrupted save
+    with open(os.path.join(path, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def load_manifest(path, version=None):
+    path = resolve(path, version)
+    with open(os.path.join(path, 'manifest.json')) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT or manifest.get('format_version', 0) > FORMAT_VERSION:
+        raise ValueError(f"{path} holds {manifest.get('format')} v{manifest.get('format_version')}, "
+                         f"expected {FORMAT} v{FORMAT_VERSION} or older")
+    return path, manifest
+
+
+def _arrays(path, manifest, mmap=True):
+    mode = 'r' if mmap else None
+    return [np.load(os.path.join(path, manifest['arrays'][name]), mmap_mode=mode) for name in ARRAYS]
+
+
+def load_matrix(path, version=None, mmap=True):
+    """The full CSR matrix; with mmap=True its arrays stay on disk until touched"""
+    path, manifest = load_manifest(path, version)
+    data, indices, indptr = _arrays(path, manifest, mmap)
+    return csr_matrix((data, indices, indptr), shape=tuple(manifest['shape']), copy=False)
+
+
+def load_rows(path, start, stop, version=None):
+    """Rows [start, stop) as an in-memory CSR matrix, reading only the bytes that hold them"""
+    path, manifest = load_manifest(path, version)
+    data, indices, indptr = _arrays(path, manifest)
+    n_rows, n_cols = manifest['shape']
+    start, stop, _ = slice(start, stop).indices(n_rows)
+    stop = max(start, stop)
+    row_ptr = np.array(indptr[start:stop + 1])
+    lo, hi = int(row_ptr[0]), int(row_ptr[-1])
+    return csr_matrix((np.array(data[lo:hi]), np.array(indices[lo:hi]), row_ptr - lo),
+                      shape=(stop - start, n_cols))
+
+
+def load_artifacts(path, version=None, mmap=True):
+    """
+    Load a saved version: the TF-IDF matrix, the vectorizer, the label encoder and the manifest
+
+    Args:
+        path: Artifact root (latest version unless `version` is given) or a version directory
+        version: Version number to load
+        mmap: Memory-map the matrix arrays instead of reading them
+
+    Returns:
+        dict: 'tfidf_matrix', 'tfidf_vectorizer', 'label_encoder', 'manifest'
+    """
+    path, manifest = load_manifest(path, version)
+    with open(os.path.join(path, manifest['tfidf_vectorizer']), 'rb') as f:
+        tfidf_vectorizer = pickle.load(f)
+    with open(os.path.join(path, manifest['label_encoder']), 'rb') as f:
+        label_encoder = pickle.load(f)
+    return {'tfidf_matrix': load_matrix(path, mmap=mmap), 'tfidf_vectorizer': tfidf_vectorizer,
+            'label_encoder': label_encoder, 'manifest': manifest}
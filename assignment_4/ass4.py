@@ -1,7 +1,13 @@
 import spacy
 from spacy.tokens import DocBin
 from spacy.training import Example
+from spacy.util import minibatch
+import hashlib
+import json
+import os
 import random
+import tempfile
+import time
 from sklearn.metrics import classification_report, precision_recall_fscore_support
 import warnings
 
@@ -64,13 +70,132 @@ def train_ner_model(train_data, n_iter=30):
     return nlp
 
 
-def evaluate_ner(nlp, test_data):
-    """Evaluate NER model and calculate metrics"""
+def to_docbin(nlp, data, path):
+    """Convert (text, annotations) pairs to annotated Docs once and save them as a DocBin file"""
+    doc_bin = DocBin()
+    for text, annotations in data:
+        example = Example.from_dict(nlp.make_doc(text), annotations)
+        doc_bin.add(example.reference)
+    doc_bin.to_disk(path)
+    return path
+
+
+def load_examples(nlp, path):
+    """Training Examples from a DocBin file written by to_docbin"""
+    docs = DocBin().from_disk(path).get_docs(nlp.vocab)
+    return [Example(nlp.make_doc(doc.text), doc) for doc in docs]
+
+
+def cached_examples(nlp, data, cache_dir=None):
+    """
+    Training Examples for (text, annotations) pairs, through a DocBin cache
+
+    The DocBin is named after a hash of the data and the spaCy version, so
+    changed training data is converted again instead of reusing a stale
+    file. Without cache_dir it is written to a temporary directory that is
+    removed once the Examples are loaded.
+    """
+    data = list(data)
+    if cache_dir is None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            return load_examples(nlp, to_docbin(nlp, data, os.path.join(tmp_dir, "train.spacy")))
+    key = json.dumps([spacy.__version__, data], sort_keys=True, ensure_ascii=False)
+    path = os.path.join(cache_dir, f"train-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.spacy")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        to_docbin(nlp, data, path)
+    return load_examples(nlp, path)
+
+
+def compounding(start, stop, compound):
+    """Batch sizes growing from start by a factor of compound per batch, capped at stop"""
+    size = start
+    while True:
+        yield int(min(size, stop))
+        size *= compound
+
+
+def train_ner_model_minibatch(train_data, dev_data=None, n_iter=30, cache_dir=None, batch_start=4.0,
+                              batch_stop=32.0, compound=1.001, drop=0.5, patience=5, target_f1=None):
+    """
+    Train a custom NER model on minibatches of Examples cached in a DocBin
+
+    The texts are tokenized and aligned once, through a DocBin that
+    cached_examples keeps in cache_dir across runs with the same data (or
+    in a temporary directory), instead of every epoch. Updates use
+    spacy.util.minibatch with compounding batch sizes. With dev_data (any
+    iterable; it is read into a list, since it is scored every epoch), the
+    model is scored after every epoch, training stops after `patience`
+    epochs without a better F1 or once `target_f1` is reached, and the best
+    weights are kept.
+
+    Returns:
+        tuple: (nlp, history) with loss, seconds and dev F1 per epoch
+    """
+    nlp = spacy.blank("en")
+    ner = nlp.add_pipe("ner")
+    
+    if dev_data is not None:
+        dev_data = list(dev_data)
+    examples = cached_examples(nlp, train_data, cache_dir)
+    for example in examples:
+        for ent in example.reference.ents:
+            ner.add_label(ent.label_)
+    
+    optimizer = nlp.initialize(lambda: examples)
+    sizes = compounding(batch_start, batch_stop, compound)
+    best_f1, best_weights, stale = -1.0, None, 0
+    history = []
+    start = time.perf_counter()
+    
+    print("Training the NER model...")
+    for iteration in range(n_iter):
+        epoch_start = time.perf_counter()
+        random.shuffle(examples)
+        losses = {}
+        
+        for batch in minibatch(examples, size=sizes):
+            nlp.update(batch, drop=drop, sgd=optimizer, losses=losses)
+        
+        record = {'epoch': iteration + 1, 'loss': losses.get('ner', 0.0),
+                  'seconds': time.perf_counter() - epoch_start}
+        if dev_data is not None:
+            record['dev_f1'] = evaluate_ner(nlp, dev_data)['f1']
+        record['elapsed'] = time.perf_counter() - start
+        history.append(record)
+        print(f"Iteration {iteration + 1}: Loss = {record['loss']:.4f}, {record['seconds']:.1f}s"
+              + (f", dev F1 = {record['dev_f1']:.4f}" if dev_data is not None else ""))
+        
+        if dev_data is None:
+            continue
+        if record['dev_f1'] > best_f1:
+            best_f1, best_weights, stale = record['dev_f1'], nlp.to_bytes(), 0
+        else:
+            stale += 1
+        if target_f1 is not None and best_f1 >= target_f1:
+            print(f"Reached dev F1 {best_f1:.4f} after {record['elapsed']:.1f}s")
+            break
+        if stale >= patience:
+            print(f"No improvement for {patience} epochs, stopping")
+            break
+    
+    if best_weights is not None:
+        nlp.from_bytes(best_weights)
+    return nlp, history
+
+
+def evaluate_ner(nlp, test_data, batch_size=256, n_process=1):
+    """
+    Evaluate NER model and calculate metrics
+
+    test_data is any iterable of (text, annotations) pairs, e.g. from
+    read_jsonl; the texts are parsed in batches with nlp.pipe.
+    """
     true_entities = []
     pred_entities = []
     
-    for text, annotations in test_data:
-        doc = nlp(text)
+    docs = nlp.pipe(test_data, as_tuples=True, batch_size=batch_size, n_process=n_process)
+    for doc, annotations in docs:
         
         # Get true entities
         true_ents = set()
@@ -110,6 +235,48 @@ def predict_entities(nlp, text):
     return entities
 
 
+def extract_entities(nlp, texts, batch_size=256, n_process=1):
+    """
+    Extract entities from many texts with nlp.pipe
+
+    Texts are consumed lazily, parsed `batch_size` at a time by `n_process`
+    processes (-1 for all cores), and yielded as (text, entities) pairs in
+    input order, with entities as in predict_entities.
+    """
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield doc.text, [(ent.text, ent.label_) for ent in doc.ents]
+
+
+def read_jsonl(path, text_field="text", with_annotations=True):
+    """
+    Stream records from a JSONL file, one line at a time
+
+    Yields (text, {"entities": [...]}) pairs for evaluate_ner, or just the
+    texts with with_annotations=False.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if with_annotations:
+                entities = [tuple(ent) for ent in record.get("entities", [])]
+                yield record[text_field], {"entities": entities}
+            else:
+                yield record[text_field]
+
+
+def extract_entities_jsonl(nlp, input_path, output_path, text_field="text", batch_size=256, n_process=1):
+    """Write {"text", "entities"} lines for every text of a JSONL file, streaming both files"""
+    count = 0
+    texts = read_jsonl(input_path, text_field, with_annotations=False)
+    with open(output_path, "w", encoding="utf-8") as out:
+        for text, entities in extract_entities(nlp, texts, batch_size, n_process):
+            out.write(json.dumps({"text": text, "entities": entities}) + "\n")
+            count += 1
+    return count
+
+
 # Main execution
 if __name__ == "__main__":
     print("=" * 60)
@@ -143,7 +310,6 @@ if __name__ == "__main__":
         "Facebook changed its name to Meta in October 2021"
     ]
     
-    for sentence in test_sentences:
-        entities = predict_entities(nlp_model, sentence)
+    for sentence, entities in extract_entities(nlp_model, test_sentences):
         print(f"\nText: {sentence}")
         print(f"Entities: {entities}")
\ No newline at end of file
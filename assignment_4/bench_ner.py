@@ -0,0 +1,97 @@
+"""
+Docs/sec of batched NER inference (extract_entities, nlp.pipe) against the
+per-call predict_entities loop of ass4.py, on synthetic annotated sentences,
+for several batch sizes and process counts, and through JSONL files.
+
+Usage: python bench_ner.py [n_sentences]
+"""
+
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+
+from ass4 import TRAIN_DATA, extract_entities, extract_entities_jsonl, predict_entities, train_ner_model
+
+PEOPLE = ["Elon Musk", "Satya Nadella", "Jeff Bezos", "Tim Cook", "Sundar Pichai", "Ada Lovelace",
+          "Priya Sharma", "Rahul Mehta", "Maria Garcia", "John Smith"]
+ORGS = ["Apple Inc.", "SpaceX", "Google", "Microsoft", "Amazon", "Tesla", "Infosys", "Meta",
+        "Whole Foods", "OpenAI"]
+PLACES = ["California", "San Francisco", "New York", "London", "Seattle", "Texas", "Mumbai",
+          "Bangalore", "Paris", "Tokyo"]
+DATES = ["Monday", "yesterday", "last week", "2017", "October 2021", "Friday", "next month"]
+MONEY = ["$1 billion", "$13.7 billion", "$250 million", "$40 million"]
+TEMPLATES = [
+    "{ORG} is looking at buying a startup in {GPE} for {MONEY}",
+    "{PERSON} founded {ORG} in {GPE} in {DATE}",
+    "{ORG} announced new products in {GPE} {DATE}",
+    "{ORG} CEO {PERSON} spoke at the conference in {GPE}",
+    "The meeting with {PERSON} is scheduled for {DATE} in {GPE}",
+    "{ORG} acquired {ORG} for {MONEY} in {DATE}",
+    "{PERSON} visited {GPE} {DATE}",
+]
+FILLERS = {"PERSON": PEOPLE, "ORG": ORGS, "GPE": PLACES, "DATE": DATES, "MONEY": MONEY}
+
+
+def make_sentences(n_sentences, seed=0):
+    """(text, {"entities": [(start, end, label), ...]}) pairs in the format of TRAIN_DATA"""
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(n_sentences):
+        template = rng.choice(TEMPLATES)
+        text, entities, position = "", [], 0
+        while True:
+            start = template.find("{", position)
+            if start < 0:
+                text += template[position:]
+                break
+            end = template.index("}", start)
+            label = template[start + 1:end]
+            value = rng.choice(FILLERS[label])
+            text += template[position:start]
+            entities.append((len(text), len(text) + len(value), label))
+            text += value
+            position = end + 1
+        sentences.append((text, {"entities": entities}))
+    return sentences
+
+
+def bench_ner(n_sentences=20_000):
+    texts = [text for text, _ in make_sentences(n_sentences)]
+    nlp = train_ner_model(list(TRAIN_DATA), n_iter=10)
+    print(f"\n{n_sentences} sentences, {mp.cpu_count()} cores")
+
+    start = time.perf_counter()
+    expected = [(text, predict_entities(nlp, text)) for text in texts]
+    loop_speed = n_sentences / (time.perf_counter() - start)
+    print(f"predict_entities loop             {loop_speed:9.0f} docs/s")
+
+    process_counts = sorted({1, 2, mp.cpu_count()})
+    for n_process in process_counts:
+        for batch_size in (32, 256, 1024):
+            start = time.perf_counter()
+            results = list(extract_entities(nlp, texts, batch_size=batch_size, n_process=n_process))
+            speed = n_sentences / (time.perf_counter() - start)
+            assert results == expected
+            print(f"extract_entities batch {batch_size:<5} x{n_process:<3} {speed:9.0f} docs/s  "
+                  f"x{speed / loop_speed:4.1f}  (same entities, same order)")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        input_path = os.path.join(workdir, "input.jsonl")
+        output_path = os.path.join(workdir, "entities.jsonl")
+        with open(input_path, "w", encoding="utf-8") as f:
+            for text in texts:
+                f.write(json.dumps({"text": text}) + "\n")
+        start = time.perf_counter()
+        count = extract_entities_jsonl(nlp, input_path, output_path, n_process=process_counts[-1])
+        speed = count / (time.perf_counter() - start)
+        with open(output_path, encoding="utf-8") as f:
+            assert [(r["text"], [tuple(e) for e in r["entities"]]) for r in map(json.loads, f)] == expected
+        print(f"JSONL to JSONL x{process_counts[-1]:<3}                {speed:9.0f} docs/s")
+
+
+if __name__ == "__main__":
+    bench_ner(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
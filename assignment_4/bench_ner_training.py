@@ -0,0 +1,85 @@
+"""
+Time per epoch and time to a target dev F1 of the minibatched, DocBin-cached
+trainer (train_ner_model_minibatch) against the per-example loop of
+train_ner_model in ass4.py, on a synthetic annotated corpus.
+
+Usage: python bench_ner_training.py [n_sentences] [target_f1]
+"""
+
+import random
+import sys
+import tempfile
+import time
+
+import spacy
+from spacy.training import Example
+
+from ass4 import cached_examples, evaluate_ner, train_ner_model_minibatch
+from bench_ner import make_sentences
+
+
+def train_per_example(train_data, dev_data, n_iter, target_f1):
+    """train_ner_model's loop: make_doc, Example.from_dict and a one-example update, every epoch"""
+    nlp = spacy.blank("en")
+    ner = nlp.add_pipe("ner")
+    for _, annotations in train_data:
+        for ent in annotations.get("entities"):
+            ner.add_label(ent[2])
+    optimizer = nlp.begin_training()
+    history = []
+    start = time.perf_counter()
+    for iteration in range(n_iter):
+        epoch_start = time.perf_counter()
+        random.shuffle(train_data)
+        losses = {}
+        for text, annotations in train_data:
+            doc = nlp.make_doc(text)
+            example = Example.from_dict(doc, annotations)
+            nlp.update([example], drop=0.5, sgd=optimizer, losses=losses)
+        seconds = time.perf_counter() - epoch_start
+        dev_f1 = evaluate_ner(nlp, dev_data)['f1']
+        history.append({'epoch': iteration + 1, 'loss': losses['ner'], 'seconds': seconds,
+                        'dev_f1': dev_f1, 'elapsed': time.perf_counter() - start})
+        print(f"Iteration {iteration + 1}: Loss = {losses['ner']:.4f}, {seconds:.1f}s, dev F1 = {dev_f1:.4f}")
+        if dev_f1 >= target_f1:
+            break
+    return history
+
+
+def summarize(name, history, target_f1):
+    per_epoch = sum(record['seconds'] for record in history) / len(history)
+    reached = next((record for record in history if record['dev_f1'] >= target_f1), None)
+    to_target = (f"{reached['elapsed']:.1f}s ({reached['epoch']} epochs)" if reached
+                 else f"not reached in {len(history)} epochs")
+    print(f"{name:<28} {per_epoch:8.1f}s/epoch  time to dev F1 {target_f1}: {to_target}  "
+          f"best F1 {max(record['dev_f1'] for record in history):.4f}")
+
+
+def bench_ner_training(n_sentences=100_000, target_f1=0.95, n_dev=2_000, max_epochs=10):
+    train_data = make_sentences(n_sentences, seed=0)
+    dev_data = make_sentences(n_dev, seed=1)
+    print(f"{n_sentences} training sentences, {n_dev} dev sentences, target dev F1 {target_f1}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        nlp = spacy.blank("en")
+        start = time.perf_counter()
+        cached_examples(nlp, train_data, cache_dir)
+        print(f"DocBin conversion: {time.perf_counter() - start:.1f}s (once)")
+        start = time.perf_counter()
+        cached_examples(nlp, train_data, cache_dir)
+        print(f"Reloading Examples: {time.perf_counter() - start:.1f}s")
+
+        print("\nMinibatched, DocBin-cached:")
+        _, minibatch_history = train_ner_model_minibatch(train_data, dev_data, n_iter=max_epochs,
+                                                         cache_dir=cache_dir, target_f1=target_f1)
+    print("\nPer-example loop:")
+    loop_history = train_per_example(list(train_data), dev_data, max_epochs, target_f1)
+
+    print()
+    summarize("per-example loop", loop_history, target_f1)
+    summarize("minibatched + DocBin", minibatch_history, target_f1)
+
+
+if __name__ == "__main__":
+    bench_ner_training(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+                       float(sys.argv[2]) if len(sys.argv) > 2 else 0.95)
@@ -5,12 +5,32 @@ using Google Translate API through the googletrans library.
 """
 
 from googletrans import Translator, LANGUAGES
+import asyncio
+import math
+import os
+import random
+import re
+import sqlite3
+import threading
 import time
-from typing import List, Dict, Tuple
+from collections import Counter, OrderedDict
+from types import SimpleNamespace
+from typing import AsyncIterator, Callable, List, Dict, Optional, Tuple
 
 # Initialize translator
 translator = Translator()
 
+# Translation memory database, in the user's cache directory rather than the working
+# tree; set TRANSLATION_MEMORY_PATH to move it (':memory:' keeps nothing on disk).
+# Read when the shared memory is first created, not at import.
+TRANSLATION_MEMORY_PATH = os.environ.get(
+    'TRANSLATION_MEMORY_PATH',
+    os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                 'nlp_assignments', 'translation_memory.db'))
+
+# Sentence boundaries for English and the Indic scripts (danda / double danda)
+SENTENCE_END = re.compile(r'(?<=[.!?\u0964\u0965])\s+')
+
 # Indian Languages supported with their language codes
 INDIAN_LANGUAGES = {
     'hindi': 'hi',
@@ -28,6 +48,335 @@ INDIAN_LANGUAGES = {
     'sanskrit': 'sa'
 }
 
+# Order in which a fan-out dispatches languages, roughly by number of speakers
+LANGUAGE_PRIORITY = ['hi', 'bn', 'te', 'mr', 'ta', 'ur', 'gu', 'kn', 'ml', 'or', 'pa', 'as', 'sa']
+
+# Unicode blocks of the scripts used by English and the Indian languages above
+SCRIPT_RANGES = [
+    (0x0041, 0x024F, 'Latin'),
+    (0x0600, 0x06FF, 'Arabic'),
+    (0x0900, 0x097F, 'Devanagari'),
+    (0x0980, 0x09FF, 'Bengali'),
+    (0x0A00, 0x0A7F, 'Gurmukhi'),
+    (0x0A80, 0x0AFF, 'Gujarati'),
+    (0x0B00, 0x0B7F, 'Oriya'),
+    (0x0B80, 0x0BFF, 'Tamil'),
+    (0x0C00, 0x0C7F, 'Telugu'),
+    (0x0C80, 0x0CFF, 'Kannada'),
+    (0x0D00, 0x0D7F, 'Malayalam'),
+]
+
+SCRIPT_LANGUAGES = {
+    'Latin': ['en'],
+    'Arabic': ['ur'],
+    'Devanagari': ['hi', 'mr', 'sa'],
+    'Bengali': ['bn', 'as'],
+    'Gurmukhi': ['pa'],
+    'Gujarati': ['gu'],
+    'Oriya': ['or'],
+    'Tamil': ['ta'],
+    'Telugu': ['te'],
+    'Kannada': ['kn'],
+    'Malayalam': ['ml'],
+}
+
+# Seed sentences for telling apart languages that share a script
+DETECTOR_SAMPLES = {
+    'hi': [
+        "यह एक हिंदी वाक्य है।",
+        "मैं आज बाज़ार जा रहा हूँ।",
+        "सभी नागरिकों से अनुरोध है कि वे सुरक्षा दिशानिर्देशों का पालन करें।",
+        "भारी बारिश की संभावना है, घर के अंदर रहें।",
+        "नमस्ते, आपका स्वागत है।",
+        "यह फिल्म बहुत अच्छी है और मुझे इसकी कहानी पसंद आई।",
+        "हम कल दिल्ली जाएंगे और वहाँ अपने दोस्तों से मिलेंगे।",
+        "क्या आप मेरी मदद कर सकते हैं?",
+        "बच्चे स्कूल में पढ़ाई कर रहे हैं।",
+        "अधिक जानकारी के लिए हेल्पलाइन पर कॉल करें।",
+    ],
+    'mr': [
+        "ही सेवा खूप छान आहे.",
+        "मला हा अनुभव अजिबात आवडला नाही.",
+        "सर्व नागरिकांना सुरक्षा मार्गदर्शक सूचनांचे पालन करण्याची विनंती आहे.",
+        "मुसळधार पावसाची शक्यता आहे, घरातच राहा.",
+        "नमस्कार, तुमचे स्वागत आहे.",
+        "मी उद्या मुंबईला जाणार आहे आणि तिथे माझ्या मित्रांना भेटणार आहे.",
+        "तुम्ही मला मदत करू शकाल का?",
+        "मुले शाळेत अभ्यास करत आहेत.",
+        "आमच्या गावात पाण्याची कमतरता आहे.",
+        "अधिक माहितीसाठी हेल्पलाइनवर संपर्क साधा.",
+    ],
+    'sa': [
+        "अहं संस्कृतं पठामि।",
+        "सः ग्रामं गच्छति।",
+        "सर्वे भवन्तु सुखिनः सर्वे सन्तु निरामयाः।",
+        "विद्या ददाति विनयम्।",
+        "सत्यमेव जयते।",
+        "वयं विद्यालयं गच्छामः।",
+        "तस्य नाम रामः अस्ति।",
+        "धर्मो रक्षति रक्षितः।",
+        "बालकाः क्रीडाङ्गणे क्रीडन्ति।",
+        "अद्य वर्षा भविष्यति, गृहे एव तिष्ठत।",
+    ],
+    'bn': [
+        "এটি একটি বাংলা বাক্য।",
+        "আমি আজ বাজারে যাচ্ছি।",
+        "সকল নাগরিকদের নিরাপত্তা নির্দেশিকা মেনে চলার অনুরোধ করা হচ্ছে।",
+        "ভারী বৃষ্টির সম্ভাবনা রয়েছে, ঘরে থাকুন।",
+        "নমস্কার, আপনাকে স্বাগত জানাই।",
+        "এই সিনেমাটি খুব ভালো।",
+        "আপনি কি আমাকে সাহায্য করতে পারেন?",
+        "ছেলেমেয়েরা স্কুলে পড়াশোনা করছে।",
+        "আরও তথ্যের জন্য হেল্পলাইনে ফোন করুন।",
+    ],
+    'as': [
+        "এইটো এটা অসমীয়া বাক্য।",
+        "মই আজি বজাৰলৈ গৈ আছোঁ।",
+        "সকলো নাগৰিকক সুৰক্ষা নিৰ্দেশনা মানি চলিবলৈ অনুৰোধ কৰা হৈছে।",
+        "প্ৰবল বৰষুণৰ সম্ভাৱনা আছে, ঘৰৰ ভিতৰত থাকক।",
+        "নমস্কাৰ, আপোনাক আদৰণি জনাইছোঁ।",
+        "এই ছবিখন বৰ ভাল।",
+        "আপুনি মোক সহায় কৰিব পাৰিবনে?",
+        "ল'ৰা-ছোৱালীবোৰে বিদ্যালয়ত পঢ়া-শুনা কৰি আছে।",
+        "অধিক তথ্যৰ বাবে হেল্পলাইনলৈ ফোন কৰক।",
+    ],
+}
+
+# Below this confidence detect_language asks the remote service instead
+LOCAL_DETECTION_THRESHOLD = 0.8
+
+
+def _success_result(text: str, result, target_lang: str) -> Dict:
+    """Build the result dict returned for a successful translation"""
+    return {
+        'success': True,
+        'original_text': text,
+        'translated_text': result.text,
+        'source_language': result.src,
+        'target_language': target_lang,
+        'pronunciation': result.pronunciation if hasattr(result, 'pronunciation') else None
+    }
+
+
+def _error_result(text: str, error: Exception) -> Dict:
+    """Build the result dict returned for a failed translation"""
+    return {
+        'success': False,
+        'error': str(error),
+        'original_text': text
+    }
+
+
+class TranslationMemory:
+    """
+    Persistent translation memory: an in-process LRU in front of SQLite
+    
+    Entries are keyed on (whitespace-normalised text, source language, target
+    language). Entries older than `ttl` seconds are treated as misses, and the
+    store is trimmed to `max_entries` by least recent use. Safe to share
+    between threads.
+    """
+
+    def __init__(self, path: Optional[str] = None, lru_size: int = 2048,
+                 ttl: Optional[float] = None, max_entries: int = 100_000,
+                 evict_every: int = 256):
+        """
+        Args:
+            path: SQLite database file (default: TRANSLATION_MEMORY_PATH; ':memory:' for a throwaway store)
+            lru_size: Entries kept in the in-process LRU
+            ttl: Seconds an entry stays valid (default: None, never expires)
+            max_entries: Entries kept on disk before least recently used ones are evicted
+            evict_every: Run eviction after this many inserts
+        """
+        self.path = path or TRANSLATION_MEMORY_PATH
+        self.lru_size = lru_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.stats = {'hits': 0, 'sentence_hits': 0, 'misses': 0, 'api_calls': 0}
+        self._lru = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn = None
+        self._puts = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse runs of whitespace so trivially different copies share an entry"""
+        return ' '.join(text.split())
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened on first use so importing the module does not create files
+        if self._conn is None:
+            if self.path != ':memory:' and os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS memory ('
+                'source_text TEXT, source_lang TEXT, target_lang TEXT, '
+                'translated_text TEXT, detected_lang TEXT, created REAL, last_used REAL, '
+                'PRIMARY KEY (source_text, source_lang, target_lang))'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS memory_last_used ON memory (last_used)')
+        return self._conn
+
+    def get(self, text: str, source_lang: str, target_lang: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up a cached translation
+        
+        Returns:
+            tuple: (translated text, detected source language), or None on a miss
+        """
+        key = (self.normalize(text), source_lang, target_lang)
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None:
+                row = self._db().execute(
+                    'SELECT translated_text, detected_lang, created FROM memory '
+                    'WHERE source_text = ? AND source_lang = ? AND target_lang = ?', key
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = row
+                self._db().execute(
+                    'UPDATE memory SET last_used = ? '
+                    'WHERE source_text = ? AND source_lang = ? AND target_lang = ?', (now, *key)
+                )
+            if self.ttl is not None and now - entry[2] > self.ttl:
+                self._lru.pop(key, None)
+                return None
+            self._remember(key, entry)
+            return entry[0], entry[1]
+
+    def put(self, text: str, source_lang: str, target_lang: str,
+            translated_text: str, detected_lang: str):
+        """Store a translation in the LRU and on disk"""
+        key = (self.normalize(text), source_lang, target_lang)
+        now = time.time()
+        with self._lock:
+            self._remember(key, (translated_text, detected_lang, now))
+            self._db().execute(
+                'INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (*key, translated_text, detected_lang, now, now)
+            )
+            self._puts += 1
+            if self._puts % self.evict_every == 0:
+                self.evict()
+            else:
+                self._db().commit()
+
+    def _remember(self, key: Tuple, entry: Tuple):
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def evict(self) -> int:
+        """
+        Drop expired entries and trim the store to max_entries
+        
+        Returns:
+            int: Number of entries removed from disk
+        """
+        with self._lock:
+            db = self._db()
+            removed = 0
+            if self.ttl is not None:
+                removed += db.execute('DELETE FROM memory WHERE created < ?',
+                                      (time.time() - self.ttl,)).rowcount
+            removed += db.execute(
+                'DELETE FROM memory WHERE rowid IN (SELECT rowid FROM memory '
+                'ORDER BY last_used DESC LIMIT -1 OFFSET ?)', (self.max_entries,)
+            ).rowcount
+            db.commit()
+            if removed:
+                self._lru.clear()
+            return removed
+
+    def record(self, stat: str, count: int = 1):
+        with self._lock:
+            self.stats[stat] += count
+
+    def api_calls_saved(self) -> int:
+        """Translator calls avoided: whole-text hits plus reused sentences"""
+        return self.stats['hits'] + self.stats['sentence_hits']
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+
+class CachedTranslator:
+    """
+    Wraps a translator client with a TranslationMemory
+    
+    Exposes the same translate() call as googletrans' Translator. A text
+    missing from memory is split into sentences; if some of them are cached
+    only the others are sent to the client. Fresh translations are stored
+    whole, and sentence by sentence when the sentence counts line up.
+    """
+
+    def __init__(self, client, memory: TranslationMemory):
+        self.client = client
+        self.memory = memory
+
+    def translate(self, text: str, src: str = 'auto', dest: str = 'en'):
+        cached = self.memory.get(text, src, dest)
+        if cached is not None:
+            self.memory.record('hits')
+            return SimpleNamespace(text=cached[0], src=cached[1], dest=dest, pronunciation=None)
+        self.memory.record('misses')
+
+        sentences = SENTENCE_END.split(text.strip())
+        pieces = [self.memory.get(sentence, src, dest) for sentence in sentences]
+        reused = sum(piece is not None for piece in pieces)
+
+        if len(sentences) > 1 and reused:
+            # Translate only the sentences the memory does not have
+            self.memory.record('sentence_hits', reused)
+            detected = next(piece[1] for piece in pieces if piece is not None)
+            for i, sentence in enumerate(sentences):
+                if pieces[i] is None:
+                    result = self._call(sentence, src, dest)
+                    pieces[i] = (result.text, result.src)
+            translated = ' '.join(piece[0] for piece in pieces)
+            self.memory.put(text, src, dest, translated, detected)
+            return SimpleNamespace(text=translated, src=detected, dest=dest, pronunciation=None)
+
+        result = self._call(text, src, dest)
+        translated_sentences = SENTENCE_END.split(result.text.strip())
+        if len(sentences) > 1 and len(translated_sentences) == len(sentences):
+            for sentence, translated in zip(sentences, translated_sentences):
+                self.memory.put(sentence, src, dest, translated, result.src)
+        self.memory.put(text, src, dest, result.text, result.src)
+        return result
+
+    def _call(self, text: str, src: str, dest: str):
+        self.memory.record('api_calls')
+        return self.client.translate(text, src=src, dest=dest)
+
+
+# Translation memory, cached translator and engine shared by the helpers below,
+# created on first use so importing this module touches no files
+_shared = {}
+
+
+def get_translation_memory() -> TranslationMemory:
+    """Translation memory shared by translate_text and the engine's clients"""
+    if 'memory' not in _shared:
+        _shared['memory'] = TranslationMemory()
+    return _shared['memory']
+
+
+def get_cached_translator() -> CachedTranslator:
+    """The module translator behind the shared translation memory"""
+    if 'translator' not in _shared:
+        _shared['translator'] = CachedTranslator(translator, get_translation_memory())
+    return _shared['translator']
+
 
 def translate_text(text: str, source_lang: str = 'auto', target_lang: str = 'hi') -> Dict:
     """
@@ -42,23 +391,323 @@ def translate_text(text: str, source_lang: str = 'auto', target_lang: str = 'hi'
         dict: Translation result containing original text, translated text, and metadata
     """
     try:
-        # Perform translation
-        result = translator.translate(text, src=source_lang, dest=target_lang)
-        
-        return {
-            'success': True,
-            'original_text': text,
-            'translated_text': result.text,
-            'source_language': result.src,
-            'target_language': target_lang,
-            'pronunciation': result.pronunciation if hasattr(result, 'pronunciation') else None
-        }
+        # Perform translation (served from the translation memory when possible)
+        result = get_cached_translator().translate(text, src=source_lang, dest=target_lang)
+        return _success_result(text, result, target_lang)
     except Exception as e:
-        return {
-            'success': False,
-            'error': str(e),
-            'original_text': text
-        }
+        return _error_result(text, e)
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for asyncio code
+    
+    Tokens refill continuously at `rate` per second up to `capacity`. A caller
+    that finds the bucket empty reserves the next token and sleeps until it is
+    due, so no lock is needed inside a single event loop.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+
+class TranslationEngine:
+    """
+    Concurrent translation engine backed by a pool of translator clients
+    
+    Requests run on worker threads, at most one per client, behind a shared
+    token-bucket rate limiter. Failed calls are retried with exponential
+    backoff and results always come back in request order.
+    
+    Short segments for the same language pair are coalesced: they are joined
+    one per line into a single call of up to `max_batch_chars` characters and
+    the response is split back on line breaks. If the line count does not
+    match, the segments are retried one call each.
+    """
+
+    def __init__(self, pool_size: int = 4, rate: float = 10.0, burst: float = None,
+                 max_retries: int = 3, backoff: float = 0.5,
+                 client_factory: Callable = Translator,
+                 memory: Optional[TranslationMemory] = None,
+                 max_batch_chars: int = 4500):
+        """
+        Args:
+            pool_size: Number of translator clients (and concurrent requests)
+            rate: Sustained request rate in requests per second
+            burst: Requests allowed back to back before rate limiting (default: pool_size)
+            max_retries: Retries per request after the first attempt fails
+            backoff: Delay before the first retry in seconds, doubled on each retry
+            client_factory: Callable returning an object with googletrans' translate() signature
+            memory: Translation memory consulted before calling the translator (default: None)
+            max_batch_chars: Character limit of a coalesced request (0 disables coalescing)
+        """
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.client_factory = client_factory
+        self.memory = memory
+        self.max_batch_chars = max_batch_chars
+        self.limiter = TokenBucket(rate, burst if burst is not None else pool_size)
+        self.stats = {'calls': 0, 'coalesced_calls': 0, 'coalesced_segments': 0,
+                      'split_failures': 0}
+        self._clients = []
+
+    def _client_pool(self) -> asyncio.Queue:
+        # Clients (and their connection pools) outlive a single event loop;
+        # the queue handing them out is created per run
+        while len(self._clients) < self.pool_size:
+            self._clients.append(self.client_factory())
+        pool = asyncio.Queue()
+        for client in self._clients:
+            pool.put_nowait(client)
+        return pool
+
+    async def _call(self, pool: asyncio.Queue, text: str, source_lang: str,
+                    target_lang: str, use_memory: bool = True):
+        # One translate() call on a pooled client, with rate limiting and retries
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            client = await pool.get()
+            caller = client
+            if use_memory and self.memory is not None:
+                caller = CachedTranslator(client, self.memory)
+            elif self.memory is not None:
+                # A direct call; calls through CachedTranslator count themselves
+                self.memory.record('api_calls')
+            try:
+                self.stats['calls'] += 1
+                return await asyncio.to_thread(caller.translate, text,
+                                               src=source_lang, dest=target_lang)
+            except asyncio.CancelledError:
+                # The worker thread may still be using this client: retire it
+                # and hand the pool a fresh one
+                self._clients[self._clients.index(client)] = client = self.client_factory()
+                raise
+            except Exception as e:
+                error = e
+            finally:
+                pool.put_nowait(client)
+            if attempt < self.max_retries:
+                delay = self.backoff * (2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        raise error
+
+    async def _translate_one(self, pool: asyncio.Queue, text: str,
+                             source_lang: str, target_lang: str) -> Dict:
+        try:
+            result = await self._call(pool, text, source_lang, target_lang)
+            return _success_result(text, result, target_lang)
+        except Exception as e:
+            return _error_result(text, e)
+
+    async def _translate_packed(self, pool: asyncio.Queue, texts: List[str],
+                                source_lang: str, target_lang: str) -> List[Dict]:
+        try:
+            result = await self._call(pool, '\n'.join(texts), source_lang, target_lang,
+                                      use_memory=False)
+            parts = [part.strip() for part in result.text.strip().split('\n')]
+        except Exception:
+            parts = []
+        if len(parts) != len(texts):
+            # The delimiters did not survive: translate each segment on its own
+            self.stats['split_failures'] += 1
+            return list(await asyncio.gather(*(self._translate_one(pool, text, source_lang, target_lang)
+                                               for text in texts)))
+
+        self.stats['coalesced_calls'] += 1
+        self.stats['coalesced_segments'] += len(texts)
+        if self.memory is not None:
+            # Only here: segments that fell back above were counted by CachedTranslator
+            self.memory.record('misses', len(texts))
+        results = []
+        for text, part in zip(texts, parts):
+            if self.memory is not None:
+                self.memory.put(text, source_lang, target_lang, part, result.src)
+            results.append(_success_result(
+                text, SimpleNamespace(text=part, src=result.src, pronunciation=None), target_lang))
+        return results
+
+    def _plan(self, requests: List[Tuple[str, str, str]],
+              results: List) -> Tuple[List[List[int]], Dict[int, List[int]]]:
+        # Group requests into calls: memory hits are answered right away,
+        # repeats of a text for the same language pair are sent once (returned
+        # as first request -> copies), single-line segments of one language
+        # pair share a call up to the character limit, anything else gets its
+        # own call. With src 'auto' the group is also keyed on the locally
+        # detected language, and segments the detector is unsure of go alone,
+        # so one auto-detected call never mixes languages.
+        batches = []
+        open_batches = {}
+        first = {}
+        duplicates = {}
+        for i, (text, src, dest) in enumerate(requests):
+            if self.memory is not None:
+                cached = self.memory.get(text, src, dest)
+                if cached is not None:
+                    self.memory.record('hits')
+                    results[i] = _success_result(
+                        text, SimpleNamespace(text=cached[0], src=cached[1], pronunciation=None), dest)
+                    continue
+            key = (TranslationMemory.normalize(text), src, dest)
+            if key in first:
+                duplicates[first[key]].append(i)
+                continue
+            first[key] = i
+            duplicates[i] = []
+            text = text.strip()
+            if '\n' in text or not text or len(text) > self.max_batch_chars:
+                batches.append([i])
+                continue
+            group = (src, dest)
+            if src == 'auto':
+                detected = local_detector.detect(text)
+                if detected['language_code'] is None or detected['confidence'] < LOCAL_DETECTION_THRESHOLD:
+                    batches.append([i])
+                    continue
+                group = (src, dest, detected['language_code'])
+            batch = open_batches.get(group)
+            if batch is not None and batch[1] + 1 + len(text) <= self.max_batch_chars:
+                batch[0].append(i)
+                batch[1] += 1 + len(text)
+            else:
+                open_batches[group] = [[i], len(text)]
+                batches.append(open_batches[group][0])
+        return batches, {i: copies for i, copies in duplicates.items() if copies}
+
+    async def translate_all(self, requests: List[Tuple[str, str, str]]) -> List[Dict]:
+        """
+        Translate (text, source_lang, target_lang) requests concurrently
+        
+        Args:
+            requests: List of (text, source language code, target language code)
+        
+        Returns:
+            list: Translation results in the same order as requests
+        """
+        pool = self._client_pool()
+        results = [None] * len(requests)
+
+        async def run_batch(batch: List[int]):
+            text, src, dest = requests[batch[0]]
+            if len(batch) == 1:
+                results[batch[0]] = await self._translate_one(pool, text, src, dest)
+                return
+            packed = await self._translate_packed(pool, [requests[i][0].strip() for i in batch],
+                                                  src, dest)
+            for i, result in zip(batch, packed):
+                result['original_text'] = requests[i][0]
+                results[i] = result
+
+        batches, duplicates = self._plan(requests, results)
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+        for i, copies in duplicates.items():
+            if self.memory is not None:
+                self.memory.record('hits', len(copies))
+            for j in copies:
+                results[j] = dict(results[i], original_text=requests[j][0])
+        return results
+
+    def run(self, requests: List[Tuple[str, str, str]]) -> List[Dict]:
+        """Blocking wrapper around translate_all for synchronous callers"""
+        return asyncio.run(self.translate_all(requests))
+
+    async def fan_out(self, text: str, target_languages: List[str] = None,
+                      source_lang: str = 'en', timeout: float = 10.0,
+                      priority: List[str] = LANGUAGE_PRIORITY) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Translate one text into many languages, yielding each result as it finishes
+        
+        Languages are dispatched in priority order, so the first ones get the
+        first clients and rate-limit tokens. A language that has not finished
+        within `timeout` seconds yields an error result instead.
+        
+        Args:
+            text: Text to translate
+            target_languages: Target language codes (default: all INDIAN_LANGUAGES)
+            source_lang: Source language code
+            timeout: Per-language deadline in seconds, counted from the start
+            priority: Language codes in dispatch order; others go last
+        
+        Yields:
+            tuple: (language code, translation result with 'elapsed' seconds)
+        """
+        if target_languages is None:
+            target_languages = list(INDIAN_LANGUAGES.values())
+        rank = {code: i for i, code in enumerate(priority)}
+        ordered = sorted(target_languages, key=lambda code: rank.get(code, len(rank)))
+        pool = self._client_pool()
+        start = time.perf_counter()
+
+        async def translate(lang: str) -> Tuple[str, Dict]:
+            try:
+                result = await asyncio.wait_for(
+                    self._translate_one(pool, text, source_lang, lang), timeout)
+            except asyncio.TimeoutError:
+                result = _error_result(text, TimeoutError(f"no translation within {timeout}s"))
+            result['elapsed'] = time.perf_counter() - start
+            return lang, result
+
+        tasks = [asyncio.create_task(translate(lang)) for lang in ordered]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def run_fan_out(self, text: str, target_languages: List[str] = None,
+                    on_result: Callable[[str, Dict], None] = None, **kwargs) -> Dict:
+        """
+        Blocking wrapper around fan_out for synchronous callers
+        
+        Args:
+            text: Text to translate
+            target_languages: Target language codes (default: all INDIAN_LANGUAGES)
+            on_result: Called with (language code, result) as each translation arrives
+            **kwargs: source_lang, timeout and priority, passed to fan_out
+        
+        Returns:
+            dict: 'results' by language code in arrival order, plus
+                  'time_to_first' and 'time_to_all' in seconds
+        """
+        async def collect() -> Dict:
+            results = {}
+            async for lang, result in self.fan_out(text, target_languages, **kwargs):
+                results[lang] = result
+                if on_result is not None:
+                    on_result(lang, result)
+            return results
+
+        # Not asyncio.run: that would wait for the worker threads of timed-out
+        # languages, which keep running until their calls return
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(collect())
+        finally:
+            loop.close()
+        elapsed = [result['elapsed'] for result in results.values()]
+        return {'results': results,
+                'time_to_first': min(elapsed, default=0.0),
+                'time_to_all': max(elapsed, default=0.0)}
+
+
+def get_engine() -> TranslationEngine:
+    """Shared engine used by the batch, document and announcement helpers"""
+    if 'engine' not in _shared:
+        _shared['engine'] = TranslationEngine(memory=get_translation_memory())
+    return _shared['engine']
 
 
 def translate_batch(texts: List[str], source_lang: str = 'auto', target_lang: str = 'hi') -> List[Dict]:
@@ -73,14 +722,7 @@ def translate_batch(texts: List[str], source_lang: str = 'auto', target_lang: st
     Returns:
         list: List of translation results
     """
-    results = []
-    
-    for text in texts:
-        result = translate_text(text, source_lang, target_lang)
-        results.append(result)
-        time.sleep(0.1)  # Small delay to avoid rate limiting
-    
-    return results
+    return get_engine().run([(text, source_lang, target_lang) for text in texts])
 
 
 def bidirectional_translate(text: str, indian_lang: str = 'hi') -> Dict:
@@ -94,9 +736,9 @@ def bidirectional_translate(text: str, indian_lang: str = 'hi') -> Dict:
     Returns:
         dict: Bidirectional translation results
     """
-    # Detect source language
-    detection = translator.detect(text)
-    source_lang = detection.lang
+    # Detect source language (locally unless the detector is unsure)
+    detection = detect_language(text)
+    source_lang = detection.get('language_code')
     
     if source_lang == 'en':
         # English to Indian language
@@ -114,13 +756,18 @@ def bidirectional_translate(text: str, indian_lang: str = 'hi') -> Dict:
         }
 
 
-def translate_public_announcement(announcement: str, target_languages: List[str]) -> Dict:
+def translate_public_announcement(announcement: str, target_languages: List[str] = None,
+                                  timeout: float = 10.0) -> Dict:
     """
     Translate a public announcement to multiple Indian languages
     
+    All languages are translated concurrently and printed as soon as each
+    one arrives, Hindi first when it is among the targets.
+    
     Args:
         announcement: The public announcement text in English
-        target_languages: List of target language codes
+        target_languages: List of target language codes (default: all INDIAN_LANGUAGES)
+        timeout: Seconds to wait for any one language before giving up on it
     
     Returns:
         dict: Translation results for all target languages
@@ -134,12 +781,10 @@ def translate_public_announcement(announcement: str, target_languages: List[str]
     
     translations = {}
     
-    for lang_code in target_languages:
+    def show(lang_code: str, result: Dict):
         lang_name = [name for name, code in INDIAN_LANGUAGES.items() if code == lang_code]
         lang_name = lang_name[0].capitalize() if lang_name else lang_code
         
-        result = translate_text(announcement, 'en', lang_code)
-        
         if result['success']:
             translations[lang_name] = result['translated_text']
             print(f"\n{lang_name} ({lang_code}):")
@@ -147,8 +792,10 @@ def translate_public_announcement(announcement: str, target_languages: List[str]
         else:
             translations[lang_name] = f"Error: {result['error']}"
             print(f"\n{lang_name} ({lang_code}): Translation failed - {result['error']}")
-        
-        time.sleep(0.2)  # Delay to avoid rate limiting
+    
+    fan_out = get_engine().run_fan_out(announcement, target_languages, on_result=show, timeout=timeout)
+    print(f"\nFirst translation after {fan_out['time_to_first']:.2f}s, "
+          f"all {len(fan_out['results'])} after {fan_out['time_to_all']:.2f}s")
     
     return translations
 
@@ -169,36 +816,145 @@ def translate_document(content: List[str], source_lang: str = 'en', target_lang:
     print(f"DOCUMENT TRANSLATION: {source_lang.upper()} → {target_lang.upper()}")
     print(f"{'='*70}")
     
-    results = []
+    results = get_engine().run([(paragraph, source_lang, target_lang) for paragraph in content])
     
-    for i, paragraph in enumerate(content, 1):
+    for i, (paragraph, result) in enumerate(zip(content, results), 1):
         print(f"\n--- Paragraph {i} ---")
         print(f"Original: {paragraph}")
         
-        result = translate_text(paragraph, source_lang, target_lang)
-        
         if result['success']:
             print(f"Translated: {result['translated_text']}")
-            results.append(result)
         else:
             print(f"Error: {result['error']}")
-            results.append(result)
-        
-        time.sleep(0.2)
     
     return results
 
 
-def detect_language(text: str) -> Dict:
+class LocalLanguageDetector:
+    """
+    Offline language detector for English and the Indian languages
+    
+    Letters are first classified by Unicode script; most scripts map to one
+    language. For scripts shared by several languages (Devanagari: Hindi,
+    Marathi, Sanskrit; Bengali: Bengali, Assamese) a character n-gram naive
+    Bayes model trained on sample sentences picks the language.
+    """
+
+    def __init__(self, samples: Dict[str, List[str]] = DETECTOR_SAMPLES, max_n: int = 3):
+        """
+        Args:
+            samples: Training sentences per language code
+            max_n: Longest character n-gram used by the model
+        """
+        self.max_n = max_n
+        self.ngram_counts = {}
+        self.features = set()
+        self.log_probs = {}
+        for lang, texts in samples.items():
+            self.train(lang, texts)
+
+    def _ngrams(self, text: str) -> List[str]:
+        padded = f" {' '.join(text.split())} "
+        return [padded[i:i + n] for n in range(1, self.max_n + 1)
+                for i in range(len(padded) - n + 1)]
+
+    def train(self, lang: str, texts: List[str]):
+        """Add sample sentences for a language to the n-gram model"""
+        counts = self.ngram_counts.setdefault(lang, Counter())
+        for text in texts:
+            counts.update(self._ngrams(text))
+        self.features.update(counts)
+
+        # Add-one smoothed log-probabilities, precomputed so detection is
+        # one dict lookup per n-gram; the key None holds the unseen value
+        vocab_size = len(self.features) + 1
+        for other, other_counts in self.ngram_counts.items():
+            denom = sum(other_counts.values()) + vocab_size
+            table = {g: math.log((c + 1) / denom) for g, c in other_counts.items()}
+            table[None] = math.log(1 / denom)
+            self.log_probs[other] = table
+
+    @staticmethod
+    def script_counts(text: str) -> Counter:
+        """Count the letters of text per script"""
+        counts = Counter()
+        for char in text:
+            if not char.isalpha():
+                continue
+            code = ord(char)
+            for low, high, script in SCRIPT_RANGES:
+                if low <= code <= high:
+                    counts[script] += 1
+                    break
+            else:
+                counts['Other'] += 1
+        return counts
+
+    def _language_scores(self, text: str, langs: List[str]) -> Dict[str, float]:
+        # Posterior over langs; n-grams of every order overlap, so the
+        # log-likelihood is divided by max_n to keep confidences honest
+        ngrams = self._ngrams(text)
+        log_likelihood = {}
+        for lang in langs:
+            table = self.log_probs[lang]
+            unseen = table[None]
+            log_likelihood[lang] = sum(table.get(g, unseen) for g in ngrams) / self.max_n
+        best = max(log_likelihood.values())
+        weights = {lang: math.exp(score - best) for lang, score in log_likelihood.items()}
+        total = sum(weights.values())
+        return {lang: weight / total for lang, weight in weights.items()}
+
+    def detect(self, text: str) -> Dict:
+        """
+        Detect the language of text
+        
+        Returns:
+            dict: language_code (None if no known script), confidence in [0, 1] and script
+        """
+        counts = self.script_counts(text)
+        letters = sum(counts.values())
+        known = {script: count for script, count in counts.items() if script in SCRIPT_LANGUAGES}
+        if not known:
+            return {'language_code': None, 'confidence': 0.0, 'script': None}
+
+        script = max(known, key=known.get)
+        share = known[script] / letters
+        langs = SCRIPT_LANGUAGES[script]
+        if len(langs) == 1:
+            return {'language_code': langs[0], 'confidence': share, 'script': script}
+
+        scores = self._language_scores(text, langs)
+        lang = max(scores, key=scores.get)
+        return {'language_code': lang, 'confidence': share * scores[lang], 'script': script}
+
+
+local_detector = LocalLanguageDetector()
+
+
+def detect_language(text: str, threshold: float = LOCAL_DETECTION_THRESHOLD) -> Dict:
     """
     Detect the language of input text
     
+    Uses the offline detector and only asks the remote service when the
+    local confidence is below the threshold.
+    
     Args:
         text: Input text
+        threshold: Minimum local confidence to skip the remote call
     
     Returns:
-        dict: Detection result with language code and confidence
+        dict: Detection result with language code, confidence and the method used
     """
+    local = local_detector.detect(text)
+    if local['language_code'] is not None and local['confidence'] >= threshold:
+        return {
+            'success': True,
+            'language_code': local['language_code'],
+            'language_name': LANGUAGES.get(local['language_code'], 'Unknown').capitalize(),
+            'confidence': local['confidence'],
+            'method': 'local'
+        }
+
     try:
         detection = translator.detect(text)
         lang_name = LANGUAGES.get(detection.lang, 'Unknown')
@@ -207,9 +963,19 @@ def detect_language(text: str) -> Dict:
             'success': True,
             'language_code': detection.lang,
             'language_name': lang_name.capitalize(),
-            'confidence': detection.confidence
+            'confidence': detection.confidence,
+            'method': 'remote'
         }
     except Exception as e:
+        if local['language_code'] is not None:
+            # Remote service unavailable: a low-confidence local guess beats nothing
+            return {
+                'success': True,
+                'language_code': local['language_code'],
+                'language_name': LANGUAGES.get(local['language_code'], 'Unknown').capitalize(),
+                'confidence': local['confidence'],
+                'method': 'local'
+            }
         return {
             'success': False,
             'error': str(e)
@@ -307,9 +1073,16 @@ def run_demo_examples():
     print(f"Gujarati: {result6['translated_text']}")
     
     # Example 7: Emergency Alert
-    print("\n--- Example 7: Emergency Alert (Multiple Languages) ---")
+    print("\n--- Example 7: Emergency Alert (All Indian Languages) ---")
     emergency = "Emergency Alert: Heavy rainfall expected. Stay indoors and stay safe."
-    translate_public_announcement(emergency, ['hi', 'te', 'kn'])
+    translate_public_announcement(emergency)
+    
+    # Translation memory usage
+    translation_memory = get_translation_memory()
+    stats = translation_memory.stats
+    print(f"\nTranslation memory: {stats['hits']} hits, {stats['sentence_hits']} sentence hits, "
+          f"{stats['misses']} misses, {stats['api_calls']} API calls "
+          f"({translation_memory.api_calls_saved()} saved)")
 
 
 def interactive_mode():
@@ -0,0 +1,156 @@
+"""
+Benchmarks for the translation helpers in ass6.py, run against the local stub
+translation server so no network access is needed.
+
+Usage: python bench_translation.py
+"""
+
+import time
+
+from ass6 import INDIAN_LANGUAGES, CachedTranslator, TranslationEngine, TranslationMemory, local_detector
+from stub_translator import StubTranslationServer, StubTranslator, stub_translate
+
+
+def make_paragraphs(count: int):
+    return [f"Paragraph {i}: please follow the safety guidelines issued today." for i in range(count)]
+
+
+def sequential_baseline(url: str, texts, target_lang: str = 'hi'):
+    """The previous translate_document loop: one call at a time with a fixed 0.2s sleep"""
+    client = StubTranslator(url)
+    results = []
+    for text in texts:
+        results.append(client.translate(text, src='en', dest=target_lang).text)
+        time.sleep(0.2)
+    return results
+
+
+def bench_engine(n_paragraphs: int = 40, latency: float = 0.05, failure_rate: float = 0.05):
+    """Sequential loop vs TranslationEngine on the same paragraphs"""
+    print(f"\n=== Engine: {n_paragraphs} paragraphs, {latency * 1000:.0f}ms latency, "
+          f"{failure_rate:.0%} failures ===")
+    texts = make_paragraphs(n_paragraphs)
+    expected = [stub_translate(text, 'hi') for text in texts]
+
+    with StubTranslationServer(latency=latency) as server:
+        start = time.perf_counter()
+        baseline = sequential_baseline(server.url, texts)
+        print(f"Sequential + sleep: {time.perf_counter() - start:6.2f}s")
+        assert baseline == expected
+
+    with StubTranslationServer(latency=latency, failure_rate=failure_rate) as server:
+        for pool_size in (1, 4, 16):
+            engine = TranslationEngine(pool_size=pool_size, rate=100.0, backoff=0.05,
+                                       max_retries=5, max_batch_chars=0,
+                                       client_factory=lambda: StubTranslator(server.url))
+            start = time.perf_counter()
+            results = engine.run([(text, 'en', 'hi') for text in texts])
+            elapsed = time.perf_counter() - start
+            assert [r['translated_text'] for r in results] == expected
+            print(f"Engine pool={pool_size:<3} {elapsed:6.2f}s")
+        print(f"Server stats: {server.stats}")
+
+
+def bench_memory(n_announcements: int = 50, latency: float = 0.02):
+    """API calls saved by the translation memory on repetitive announcements"""
+    print(f"\n=== Translation memory: {n_announcements} announcements ===")
+    header = "Important Notice from the District Administration."
+    guideline = "All citizens are requested to follow safety guidelines."
+    helpline = "For more information, call the helpline 1800-000-000."
+    announcements = [f"{header} Ward {i % 10} water supply will be off on Sunday. {guideline} {helpline}"
+                     for i in range(n_announcements)]
+
+    with StubTranslationServer(latency=latency) as server:
+        memory = TranslationMemory(':memory:')
+        client = CachedTranslator(StubTranslator(server.url), memory)
+        start = time.perf_counter()
+        for text in announcements:
+            client.translate(text, src='en', dest='hi')
+        elapsed = time.perf_counter() - start
+        print(f"{elapsed:6.2f}s, stats={memory.stats}, "
+              f"API calls saved={memory.api_calls_saved()}, server requests={server.stats['requests']}")
+
+
+def bench_coalescing(n_segments: int = 500, latency: float = 0.05):
+    """One call per segment vs segments packed into shared calls"""
+    print(f"\n=== Coalescing: {n_segments} short segments, {latency * 1000:.0f}ms latency ===")
+    texts = [f"Line {i}: stay indoors." for i in range(n_segments)]
+    expected = [stub_translate(text, 'hi') for text in texts]
+
+    for join_lines in (False, True):
+        with StubTranslationServer(latency=latency, join_lines=join_lines) as server:
+            for max_batch_chars in (0, 1000, 4500):
+                engine = TranslationEngine(pool_size=4, rate=100.0, max_batch_chars=max_batch_chars,
+                                           client_factory=lambda: StubTranslator(server.url))
+                requests_before = server.stats['requests']
+                start = time.perf_counter()
+                results = engine.run([(text, 'en', 'hi') for text in texts])
+                elapsed = time.perf_counter() - start
+                assert [r['translated_text'] for r in results] == expected
+                label = 'delimiters lost' if join_lines else 'delimiters kept'
+                print(f"{label}, max_batch_chars={max_batch_chars:<5} {elapsed:6.2f}s  "
+                      f"server requests={server.stats['requests'] - requests_before:<4} "
+                      f"stats={engine.stats}")
+
+
+def bench_fanout(latency: float = 0.3, slow_latency: float = 3.0, timeout: float = 1.0):
+    """Announcement into all Indian languages: sequential loop vs streaming fan-out"""
+    languages = list(INDIAN_LANGUAGES.values())
+    print(f"\n=== Fan-out: {len(languages)} languages, {latency * 1000:.0f}ms latency, "
+          f"'sa' at {slow_latency:.0f}s, {timeout:.0f}s timeout ===")
+    text = "Emergency Alert: Heavy rainfall expected. Stay indoors and stay safe."
+
+    with StubTranslationServer(latency=latency, latency_by_lang={'sa': slow_latency}) as server:
+        client = StubTranslator(server.url)
+        start = time.perf_counter()
+        first = None
+        for lang in languages[:-1]:
+            client.translate(text, src='en', dest=lang)
+            first = first or time.perf_counter() - start
+            time.sleep(0.2)
+        print(f"Sequential (without 'sa'): first {first:5.2f}s, all {time.perf_counter() - start:5.2f}s")
+
+        engine = TranslationEngine(pool_size=len(languages), rate=100.0, max_retries=0,
+                                   client_factory=lambda: StubTranslator(server.url))
+        arrivals = []
+        fan_out = engine.run_fan_out(text, languages, timeout=timeout,
+                                     on_result=lambda lang, result: arrivals.append(lang))
+        results = fan_out['results']
+        assert all(results[lang]['translated_text'] == stub_translate(text, lang)
+                   for lang in languages if lang != 'sa')
+        assert not results['sa']['success']
+        print(f"Fan-out: first {fan_out['time_to_first']:5.2f}s, all {fan_out['time_to_all']:5.2f}s, "
+              f"arrival order {' '.join(arrivals)}")
+
+        engine = TranslationEngine(pool_size=2, rate=100.0, max_retries=0,
+                                   client_factory=lambda: StubTranslator(server.url))
+        fan_out = engine.run_fan_out(text, languages[:-1], timeout=10.0)
+        print(f"Fan-out pool=2: first {fan_out['time_to_first']:5.2f}s ({next(iter(fan_out['results']))}), "
+              f"all {fan_out['time_to_all']:5.2f}s, order {' '.join(fan_out['results'])}")
+
+
+def bench_detection(repeats: int = 2000):
+    """Per-call latency of the offline language detector"""
+    print(f"\n=== Local language detection ===")
+    samples = {
+        'en': "Emergency Alert: Heavy rainfall expected. Stay indoors and stay safe.",
+        'hi': "यह एक हिंदी वाक्य है।",
+        'mr': "मला हा अनुभव अजिबात आवडला नाही.",
+        'ta': "இது ஒரு தமிழ் வாக்கியம்.",
+        'bn': "এটি একটি বাংলা বাক্য।",
+    }
+    for expected, text in samples.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            detection = local_detector.detect(text)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{expected}: detected={detection['language_code']} "
+              f"confidence={detection['confidence']:.3f} {elapsed * 1e6:7.1f}µs")
+
+
+if __name__ == "__main__":
+    bench_engine()
+    bench_memory()
+    bench_coalescing()
+    bench_fanout()
+    bench_detection()
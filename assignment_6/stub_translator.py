@@ -0,0 +1,145 @@
+"""
+Local stub translation service for exercising the translation engine offline.
+The server "translates" by tagging every sentence with the target language code,
+so results are deterministic and easy to check, and it can add latency and
+random failures to imitate the real service.
+"""
+
+import http.client
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict
+from urllib.parse import urlparse
+
+
+def stub_translate(text: str, target_lang: str) -> str:
+    """Deterministic stand-in for a translation: tag each sentence with the target code"""
+    return '\n'.join(' '.join(f"[{target_lang}] {sentence}" for sentence in re.split(r'(?<=[.!?])\s+', line))
+                     for line in text.split('\n'))
+
+
+class StubTranslationServer:
+    """
+    Threaded HTTP server answering POST /translate with JSON
+    
+    Request body: {"text": ..., "src": ..., "dest": ...}
+    Response body: {"text": ..., "src": ...}
+    """
+
+    def __init__(self, latency: float = 0.05, failure_rate: float = 0.0,
+                 join_lines: bool = False, host: str = '127.0.0.1', port: int = 0,
+                 latency_by_lang: Dict[str, float] = None):
+        """
+        Args:
+            latency: Seconds each request takes to answer
+            failure_rate: Fraction of requests answered with HTTP 503
+            join_lines: Collapse line breaks in responses, like a service that loses delimiters
+            host: Interface to bind
+            port: Port to bind (default: 0 for any free port)
+            latency_by_lang: Latency overrides by target language code
+        """
+        self.latency = latency
+        self.latency_by_lang = latency_by_lang or {}
+        self.failure_rate = failure_rate
+        self.join_lines = join_lines
+        self.stats = {'requests': 0, 'failures': 0, 'characters': 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                time.sleep(stub.latency_by_lang.get(body['dest'], stub.latency))
+                with stub._lock:
+                    stub.stats['requests'] += 1
+                    stub.stats['characters'] += len(body['text'])
+                    failed = random.random() < stub.failure_rate
+                    if failed:
+                        stub.stats['failures'] += 1
+                if failed:
+                    self._reply(503, {'error': 'Service Unavailable'})
+                    return
+                src = body.get('src', 'auto')
+                translated = stub_translate(body['text'], body['dest'])
+                if stub.join_lines:
+                    translated = translated.replace('\n', ' ')
+                self._reply(200, {'text': translated, 'src': 'en' if src == 'auto' else src})
+
+            def _reply(self, status: int, payload: Dict):
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'StubTranslationServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class StubTranslator:
+    """
+    Client for StubTranslationServer with googletrans' translate() signature
+    
+    Keeps one keep-alive connection open, so a pool of these behaves like a
+    pool of connection-reusing translator clients.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.timeout = timeout
+        self._conn = None
+
+    def translate(self, text: str, src: str = 'auto', dest: str = 'en') -> SimpleNamespace:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        body = json.dumps({'text': text, 'src': src, 'dest': dest}).encode('utf-8')
+        try:
+            self._conn.request('POST', '/translate', body,
+                               {'Content-Type': 'application/json'})
+            response = self._conn.getresponse()
+            payload = json.loads(response.read())
+        except (http.client.HTTPException, OSError):
+            self._conn.close()
+            self._conn = None
+            raise
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {payload.get('error')}")
+        return SimpleNamespace(text=payload['text'], src=payload['src'],
+                               dest=dest, pronunciation=None)
@@ -0,0 +1,88 @@
+"""
+Tests for the coalescing and translation-memory accounting of TranslationEngine,
+using an in-process fake client so no network access is needed.
+
+Usage: python -m pytest assignment_6
+"""
+
+import threading
+from types import SimpleNamespace
+
+from ass6 import TranslationEngine, TranslationMemory, local_detector
+
+SEGMENTS = {
+    'en': ["Stay indoors during the storm.", "Schools will remain closed tomorrow."],
+    'hi': ["सभी नागरिकों से अनुरोध है कि वे घर के अंदर रहें।", "कल सभी विद्यालय बंद रहेंगे।"],
+    'bn': ["সবাইকে ঘরের ভিতরে থাকার অনুরোধ করা হচ্ছে।", "আগামীকাল সব স্কুল বন্ধ থাকবে।"],
+    'ta': ["அனைவரும் வீட்டுக்குள் இருக்குமாறு கேட்டுக்கொள்ளப்படுகிறார்கள்.", "நாளை பள்ளிகள் மூடப்படும்."],
+}
+
+
+class FakeTranslator:
+    """
+    Auto-detects like the real service, one language for the whole text,
+    and tags every line with it; can drop line breaks like a service that
+    loses delimiters
+    """
+
+    calls = []
+    lock = threading.Lock()
+
+    def __init__(self, join_lines=False):
+        self.join_lines = join_lines
+
+    def translate(self, text, src='auto', dest='en'):
+        with self.lock:
+            self.calls.append(text)
+        if src == 'auto':
+            src = local_detector.detect(text)['language_code']
+        separator = ' ' if self.join_lines else '\n'
+        translated = separator.join(f"[{src}->{dest}] {line}" for line in text.split('\n'))
+        return SimpleNamespace(text=translated, src=src, dest=dest, pronunciation=None)
+
+
+def make_engine(join_lines=False):
+    FakeTranslator.calls = []
+    memory = TranslationMemory(':memory:')
+    engine = TranslationEngine(pool_size=2, rate=1000.0, memory=memory,
+                               client_factory=lambda: FakeTranslator(join_lines))
+    return engine, memory
+
+
+def test_mixed_language_batch_is_not_packed_across_languages():
+    engine, memory = make_engine()
+    requests = [(text, 'auto', 'en') for pair in zip(*SEGMENTS.values()) for text in pair]
+    results = engine.run(requests)
+
+    expected_lang = {text: lang for lang, texts in SEGMENTS.items() for text in texts}
+    for (text, _, _), result in zip(requests, results):
+        assert result['success']
+        assert result['source_language'] == expected_lang[text]
+        assert result['translated_text'] == f"[{expected_lang[text]}->en] {text}"
+        assert memory.get(text, 'auto', 'en') == (result['translated_text'], expected_lang[text])
+    for call in FakeTranslator.calls:
+        assert len({expected_lang[line] for line in call.split('\n')}) == 1
+    assert len(FakeTranslator.calls) == len(SEGMENTS)
+
+
+def test_repeated_segments_are_sent_once():
+    engine, memory = make_engine()
+    texts = SEGMENTS['en'] * 3 + ["  Stay indoors   during the storm. "]
+    results = engine.run([(text, 'en', 'hi') for text in texts])
+
+    assert [r['original_text'] for r in results] == texts
+    assert [r['translated_text'] for r in results[:6]] == [f"[en->hi] {t}" for t in SEGMENTS['en'] * 3]
+    assert FakeTranslator.calls == ['\n'.join(SEGMENTS['en'])]
+    assert memory.stats == {'hits': 5, 'sentence_hits': 0, 'misses': 2, 'api_calls': 1}
+
+
+def test_split_failure_counts_each_segment_once():
+    engine, memory = make_engine(join_lines=True)
+    texts = SEGMENTS['en'] + ["Keep emergency numbers handy."]
+    results = engine.run([(text, 'en', 'hi') for text in texts])
+
+    assert [r['translated_text'] for r in results] == [f"[en->hi] {t}" for t in texts]
+    assert engine.stats['split_failures'] == 1
+    # One packed call whose split failed, then one call per segment
+    assert memory.stats['api_calls'] == len(FakeTranslator.calls) == 1 + len(texts)
+    assert memory.stats['misses'] == len(texts)
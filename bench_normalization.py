@@ -0,0 +1,178 @@
+"""
+Tokens/sec of the stemmers and lemmatizer used across the assignments, with and
+without the shared NormalizationCache, on a Zipf-distributed synthetic corpus,
+and of the fused TextNormalizer against the regex-based preprocessing it replaced.
+
+Usage: python bench_normalization.py [n_tokens]
+"""
+
+import gc
+import itertools
+import random
+import re
+import string
+import sys
+import tempfile
+import time
+
+from nltk.stem import PorterStemmer, SnowballStemmer, WordNetLemmatizer
+
+from normalization import LemmaTable, NormalizationCache, TextNormalizer
+
+ROOTS = ("work run play walk talk jump look call help move live love open close start turn "
+         "show hear leave bring write read sing speak teach learn build break drive fly grow "
+         "govern develop educate organize connect create relate nation process manage market "
+         "compute inform transport communicate employ produce operate respond visit travel "
+         "train test report serve pay buy sell study carry follow watch happen reach remain "
+         "happy quick easy kind dark strong hard soft fair bright clear child goose mouse").split()
+SUFFIXES = ['', 's', 'ed', 'ing', 'er', 'ers', 'ly', 'ness', 'ment', 'ation', 'ations', 'able']
+
+
+def make_corpus(n_tokens, n_types=50_000, exponent=1.07, seed=0):
+    """Zipf-distributed tokens: inflected real words at the top ranks, a long tail of rare forms"""
+    rng = random.Random(seed)
+    vocab = [root + suffix for root in ROOTS for suffix in SUFFIXES]
+    rng.shuffle(vocab)
+    while len(vocab) < n_types:
+        infix = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 5)))
+        vocab.append(rng.choice(ROOTS) + infix + rng.choice(SUFFIXES))
+    weights = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, n_types + 1)))
+    return vocab, rng.choices(vocab, cum_weights=weights, k=n_tokens)
+
+
+def tokens_per_second(normalize, tokens):
+    start = time.perf_counter()
+    results = [normalize(token) for token in tokens]
+    return len(tokens) / (time.perf_counter() - start), results
+
+
+def bench_normalizer(name, normalize, vocab, tokens, maxsizes=(1_000, 10_000, 100_000), table_types=20_000):
+    speed, expected = tokens_per_second(normalize, tokens)
+    print(f"{name:<10} uncached          {speed:12.0f} tokens/s")
+    for maxsize in maxsizes:
+        cached = NormalizationCache(normalize, maxsize=maxsize)
+        cached_speed, results = tokens_per_second(cached, tokens)
+        assert results == expected
+        print(f"{name:<10} LRU {maxsize:<7}       {cached_speed:12.0f} tokens/s  x{cached_speed / speed:5.1f}  "
+              f"hit rate {cached.stats()['hit_rate']:.2%}")
+
+    # The table is closed before its directory is removed
+    with tempfile.TemporaryDirectory() as table_dir:
+        start = time.perf_counter()
+        with LemmaTable.build(vocab[:table_types], normalize, table_dir) as table:
+            build_time = time.perf_counter() - start
+            cached = NormalizationCache(normalize, maxsize=maxsizes[0], table=table)
+            cached_speed, results = tokens_per_second(cached, tokens)
+            assert results == expected
+            stats = cached.stats()
+            print(f"{name:<10} LRU {maxsizes[0]:<7} + table {cached_speed:12.0f} tokens/s  "
+                  f"x{cached_speed / speed:5.1f}  hit rate {stats['hit_rate']:.2%} (LRU {stats['lru_hit_rate']:.2%})  "
+                  f"table hits {stats['table_hits']}  ({len(table)} entries built in {build_time:.2f}s)")
+
+
+def bench_normalization(n_tokens=1_000_000):
+    vocab, tokens = make_corpus(n_tokens)
+    print(f"{n_tokens} tokens, {len(set(tokens))} distinct")
+    normalizers = {'porter': PorterStemmer().stem,
+                   'snowball': SnowballStemmer('english').stem,
+                   'wordnet': WordNetLemmatizer().lemmatize}
+    for name, normalize in normalizers.items():
+        try:
+            normalize('warmup')
+        except LookupError:
+            print(f"{name:<10} skipped: NLTK data not installed")
+            continue
+        bench_normalizer(name, normalize, vocab, tokens)
+
+
+def reference_clean_text(text):
+    """assign3's clean_text before TextNormalizer"""
+    text = str(text).lower()
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def reference_lemmatize_text(text, lemmatize, stop_words):
+    """assign3's lemmatize_text before TextNormalizer"""
+    words = text.split()
+    lemmatized = [lemmatize(word) for word in words if word not in stop_words]
+    return ' '.join(lemmatized)
+
+
+def reference_preprocess_text(text):
+    """Lab10's preprocess_text before TextNormalizer"""
+    text = text.lower()
+    text = re.sub(r'[^a-z\s]', '', text)
+    return text.split()
+
+
+def make_documents(n_docs, seed=0):
+    """Noisy documents: mixed case, digits, punctuation, tabs and a few non-ASCII characters"""
+    rng = random.Random(seed)
+    _, tokens = make_corpus(n_docs * 30, seed=seed)
+    noise = ['!', '?', ',', '.', '...', ' 123', '#', '@', '\t', '  ', '\n', ' café', ' naïve', '—']
+    documents = []
+    for i in range(n_docs):
+        start = i * 30
+        words = [word.capitalize() if rng.random() < 0.1 else word
+                 for word in tokens[start:start + rng.randint(5, 30)]]
+        documents.append(' '.join(word + rng.choice(noise) if rng.random() < 0.2 else word for word in words))
+    return documents
+
+
+def docs_per_second(function, documents):
+    # Collector passes over earlier results would be charged to whichever run comes second
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        results = [function(document) for document in documents]
+        return len(documents) / (time.perf_counter() - start), results
+    finally:
+        gc.enable()
+
+
+def bench_fused(n_docs=100_000):
+    """TextNormalizer against assign3's clean_text + lemmatize_text and Lab10's preprocess_text"""
+    documents = make_documents(n_docs)
+    try:
+        from nltk.corpus import stopwords
+        stop_words, stop_source = stopwords.words('english'), 'NLTK'
+    except LookupError:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        stop_words, stop_source = sorted(ENGLISH_STOP_WORDS), 'scikit-learn'
+    try:
+        WordNetLemmatizer().lemmatize('warmup')
+        lemmatize, lemma_source = NormalizationCache(WordNetLemmatizer().lemmatize), 'WordNet'
+    except LookupError:
+        lemmatize, lemma_source = NormalizationCache(PorterStemmer().stem), 'Porter (WordNet data not installed)'
+    print(f"\n{n_docs} documents, {stop_source} stop words, {lemma_source} normalizer (cached, warmed)")
+    for document in documents:
+        for word in reference_clean_text(document).split():
+            lemmatize(word)
+
+    stop_set = set(stop_words)
+    normalizer = TextNormalizer(stop_words, lemmatize)
+    cleaner = TextNormalizer()
+    cases = [
+        ('assign3 clean_text + lemmatize_text',
+         lambda d: reference_lemmatize_text(reference_clean_text(d), lemmatize, stop_set),
+         lambda d: ' '.join(normalizer.tokens(d))),
+        ('assign3 clean_text', reference_clean_text, lambda d: ' '.join(cleaner.tokens(d))),
+        ('Lab10 preprocess_text', reference_preprocess_text, cleaner.tokens),
+    ]
+    for name, reference, fused in cases:
+        reference_speed, expected = docs_per_second(reference, documents)
+        fused_speed, results = docs_per_second(fused, documents)
+        assert results == expected
+        print(f"{name:<36} {reference_speed:9.0f} -> {fused_speed:9.0f} docs/s  x{fused_speed / reference_speed:4.2f}  "
+              f"(outputs identical)")
+
+    lazy_speed, _ = docs_per_second(lambda d: sum(1 for _ in normalizer(d, lazy=True)), documents)
+    print(f"{'generator (lazy=True), consumed':<36} {lazy_speed:22.0f} docs/s")
+
+
+if __name__ == "__main__":
+    bench_normalization(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
+    bench_fused()
@@ -0,0 +1,205 @@
+"""
+Shared memoization for word normalizers (stemmers and lemmatizers).
+
+Word frequencies follow Zipf's law, so a small table of results covers most
+tokens of any corpus. NormalizationCache puts a bounded LRU in front of a
+normalizer such as PorterStemmer().stem or WordNetLemmatizer().lemmatize,
+optionally backed by a precomputed LemmaTable that is memory-mapped from
+disk, and reports how often each layer answered.
+
+TextNormalizer fuses the usual lowercase / strip non-letters / split /
+drop stop words chain into a few C-level passes per text.
+
+Usage:
+    from normalization import NormalizationCache, TextNormalizer
+    lemmatize = NormalizationCache(WordNetLemmatizer().lemmatize)
+    lemmatize('geese'), lemmatize('running', pos='v'), lemmatize.stats()
+    TextNormalizer(stop_words, lemmatize).tokens("The geese were running!")
+"""
+
+import codecs
+import functools
+import mmap
+import os
+
+import numpy as np
+
+
+class LemmaTable:
+    """
+    Precomputed word -> normal form table that is memory-mapped on load
+
+    Keys are stored sorted as concatenated UTF-8 bytes with an offsets array,
+    values likewise in key order. Lookups binary-search the mapped files, so
+    opening a table costs nothing up front and processes share its pages.
+    """
+
+    FILES = ('keys.bin', 'key_offsets.npy', 'values.bin', 'value_offsets.npy')
+
+    def __init__(self, keys, key_offsets, values, value_offsets):
+        self.keys = keys
+        self.key_offsets = key_offsets
+        self.values = values
+        self.value_offsets = value_offsets
+
+    def __len__(self):
+        return len(self.key_offsets) - 1
+
+    @staticmethod
+    def _map(path):
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def build(cls, words, normalize, path):
+        """Normalize each distinct word once, write the table to directory `path` and load it"""
+        keys = sorted({word.encode('utf-8') for word in words})
+        values = [normalize(key.decode('utf-8')).encode('utf-8') for key in keys]
+        os.makedirs(path, exist_ok=True)
+        for items, blob_name, offsets_name in ((keys, *cls.FILES[:2]), (values, *cls.FILES[2:])):
+            with open(os.path.join(path, blob_name), 'wb') as f:
+                f.write(b''.join(items))
+            lengths = np.fromiter(map(len, items), dtype=np.int64, count=len(items))
+            np.save(os.path.join(path, offsets_name), np.concatenate(([0], np.cumsum(lengths))))
+        return cls.load(path)
+
+    @classmethod
+    def load(cls, path):
+        keys, key_offsets, values, value_offsets = (os.path.join(path, name) for name in cls.FILES)
+        # Memoryviews over the mapped offsets index to plain ints, much faster than numpy scalars
+        return cls(cls._map(keys), memoryview(np.load(key_offsets, mmap_mode='r')),
+                   cls._map(values), memoryview(np.load(value_offsets, mmap_mode='r')))
+
+    def close(self):
+        """Unmap the table files; lookups fail afterwards"""
+        for offsets in (self.key_offsets, self.value_offsets):
+            offsets.release()
+        for blob in (self.keys, self.values):
+            if isinstance(blob, mmap.mmap):
+                blob.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, word):
+        key = word.encode('utf-8')
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.keys[self.key_offsets[mid]:self.key_offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self.keys[self.key_offsets[lo]:self.key_offsets[lo + 1]] == key:
+            return self.values[self.value_offsets[lo]:self.value_offsets[lo + 1]].decode('utf-8')
+        return None
+
+
+class NormalizationCache:
+    """
+    Bounded LRU in front of a word normalizer
+
+    Calls take the same arguments as the wrapped function. On an LRU miss a
+    plain one-word call is looked up in `table` before falling back to the
+    normalizer; calls with extra arguments (such as pos='v') always go to the
+    normalizer, since the table holds default-argument results only.
+    """
+
+    def __init__(self, normalize, maxsize=100_000, table=None):
+        self.normalize = normalize
+        self.table = table
+        self.table_hits = 0
+        self._cached = functools.lru_cache(maxsize=maxsize)(self._compute)
+
+    def _compute(self, word, *args, **kwargs):
+        if self.table is not None and not args and not kwargs:
+            value = self.table.get(word)
+            if value is not None:
+                self.table_hits += 1
+                return value
+        return self.normalize(word, *args, **kwargs)
+
+    def __call__(self, word, *args, **kwargs):
+        return self._cached(word, *args, **kwargs)
+
+    def stats(self):
+        """
+        Lookup counts: LRU hits, table hits and misses (calls that reached the normalizer)
+
+        hit_rate counts both LRU and table hits, i.e. the share of lookups
+        the normalizer was spared; lru_hit_rate counts LRU hits only.
+        """
+        info = self._cached.cache_info()
+        lookups = info.hits + info.misses
+        # Table hits happen inside LRU misses
+        return {'hits': info.hits, 'table_hits': self.table_hits, 'misses': info.misses - self.table_hits,
+                'size': info.currsize,
+                'hit_rate': (info.hits + self.table_hits) / lookups if lookups else 0.0,
+                'lru_hit_rate': info.hits / lookups if lookups else 0.0}
+
+    def clear(self):
+        self._cached.cache_clear()
+        self.table_hits = 0
+
+
+# ASCII bytes that are neither letters nor whitespace
+NON_LETTERS = bytes(code for code in range(128) if not (chr(code).isalpha() or chr(code).isspace()))
+
+
+def _space_or_drop(error):
+    # Encoding error handler for a run of non-ASCII characters: whitespace
+    # still separates words, every other character is dropped
+    run = error.object[error.start:error.end]
+    return (' ' if any(char.isspace() for char in run) else ''), error.end
+
+
+codecs.register_error('normalization.space_or_drop', _space_or_drop)
+
+
+def split_letters(text):
+    """
+    Words of `text` lowercased and reduced to the letters a-z
+
+    Same result as re.sub(r'[^a-z\s]', '', text.lower()).split(), but the
+    characters are dropped while encoding to ASCII and by one bytes.translate.
+    """
+    return (str(text).lower().encode('ascii', 'normalization.space_or_drop')
+            .translate(None, NON_LETTERS).decode('ascii').split())
+
+
+class TextNormalizer:
+    """
+    Single-pass tokenizer: lowercase, keep a-z, split, drop stop words, normalize
+
+    split_letters replaces lower() and the regex passes, and stop words are
+    tested against a frozenset before the optional word normalizer (a
+    stemmer or a NormalizationCache) is applied, so no intermediate string
+    is built per step.
+    """
+
+    def __init__(self, stop_words=(), normalize=None):
+        self.stop_words = frozenset(stop_words)
+        self.normalize = normalize
+
+    def iter_tokens(self, text):
+        """Yield the normalized tokens of `text` lazily"""
+        stop_words, normalize = self.stop_words, self.normalize
+        for word in split_letters(text):
+            if word not in stop_words:
+                yield normalize(word) if normalize is not None else word
+
+    def tokens(self, text):
+        """Normalized tokens of `text` as a list"""
+        words = split_letters(text)
+        stop_words, normalize = self.stop_words, self.normalize
+        if normalize is None:
+            return [word for word in words if word not in stop_words] if stop_words else words
+        return [normalize(word) for word in words if word not in stop_words]
+
+    def __call__(self, text, lazy=False):
+        return self.iter_tokens(text) if lazy else self.tokens(text)
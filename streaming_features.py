@@ -0,0 +1,179 @@
+"""
+Out-of-core bag-of-words and TF-IDF features with bounded memory.
+
+StreamingTfidfVectorizer hashes terms into a fixed number of columns instead
+of keeping a vocabulary, so memory depends on `n_features` and the chunk
+size, not on the corpus. Document frequencies are accumulated chunk by chunk
+(partial_fit), and a second streaming pass applies the IDF weights
+(transform_iter). With the same tokenization and IDF formula as
+scikit-learn's TfidfVectorizer, the weights match it up to hash collisions.
+
+normalize_rows scales the rows of a CSR matrix in place, a block of rows at
+a time, and write_rows prints one in chunks, so neither builds a dense copy.
+
+Usage:
+    vectorizer = StreamingTfidfVectorizer().fit(iter_chunks(documents, 10_000))
+    for block in vectorizer.transform_iter(iter_chunks(documents, 10_000)):
+        ...
+    write_rows(normalize_rows(counts, 'l1'), sys.stdout, feature_names)
+"""
+
+import itertools
+import sys
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+def iter_chunks(documents, chunksize):
+    """Lists of up to `chunksize` documents from any iterable"""
+    documents = iter(documents)
+    while True:
+        chunk = list(itertools.islice(documents, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def normalize_rows(matrix, norm='l2', block_nnz=2 ** 22):
+    """
+    Scale each row of a CSR matrix to unit L1, L2 or max norm, in place
+
+    Works on matrix.data and matrix.indptr directly, `block_nnz` stored values
+    at a time, so the temporaries are bounded by the block and not by the
+    matrix. Rows that are all zero are left as they are. Returns `matrix`.
+    """
+    if not sparse.issparse(matrix) or matrix.format != 'csr':
+        raise TypeError(f"expected a CSR matrix, got {type(matrix).__name__}")
+    if not np.issubdtype(matrix.dtype, np.floating):
+        raise TypeError(f"cannot normalize {matrix.dtype} values in place; build the matrix with a float dtype")
+    if norm not in ('l1', 'l2', 'max'):
+        raise ValueError(f"unknown norm {norm!r}, expected 'l1', 'l2' or 'max'")
+
+    data, indptr = matrix.data, matrix.indptr
+    n_rows = matrix.shape[0]
+    start = 0
+    while start < n_rows:
+        # Take rows until the block holds block_nnz values (at least one row)
+        stop = int(np.searchsorted(indptr, indptr[start] + block_nnz, side='right')) - 1
+        stop = min(max(stop, start + 1), n_rows)
+        lo, hi = int(indptr[start]), int(indptr[stop])
+        lengths = np.diff(indptr[start:stop + 1])
+        filled = lengths > 0
+        if lo < hi:
+            block = data[lo:hi]
+            # reduceat over the starts of non-empty rows sums exactly one row per start
+            starts = indptr[start:stop][filled] - lo
+            if norm == 'l2':
+                norms = np.sqrt(np.add.reduceat(block * block, starts))
+            elif norm == 'l1':
+                norms = np.add.reduceat(np.abs(block), starts)
+            else:
+                norms = np.maximum.reduceat(np.abs(block), starts)
+            norms[norms == 0] = 1
+            block /= np.repeat(norms.astype(data.dtype, copy=False), lengths[filled])
+        start = stop
+    return matrix
+
+
+def write_rows(matrix, out=None, feature_names=None, chunk_rows=10_000, precision=6, row_offset=0):
+    """
+    Write the nonzero entries of a sparse matrix, one line per row, a chunk of rows at a time
+
+    Each line is the row number followed by tab-separated `column:value`
+    pairs, with column names from `feature_names` when given. Only
+    `chunk_rows` rows are formatted at once. `out` is a text file or
+    sys.stdout by default.
+    """
+    out = sys.stdout if out is None else out
+    matrix = sparse.csr_matrix(matrix)
+    names = np.asarray(feature_names, dtype=object) if feature_names is not None else None
+    for start in range(0, matrix.shape[0], chunk_rows):
+        chunk = matrix[start:start + chunk_rows]
+        chunk.sort_indices()
+        values = np.char.mod(f'%.{precision}g', chunk.data)
+        columns = names[chunk.indices] if names is not None else chunk.indices.astype(str)
+        entries = np.char.add(np.char.add(columns.astype(str), ':'), values)
+        lines = []
+        for row, (lo, hi) in enumerate(zip(chunk.indptr[:-1], chunk.indptr[1:]), start=row_offset + start):
+            lines.append('\t'.join([str(row), *entries[lo:hi]]))
+        out.write('\n'.join(lines) + '\n')
+
+
+class StreamingTfidfVectorizer:
+    """
+    Feature-hashing TF-IDF fitted incrementally over chunks of documents
+
+    Args:
+        n_features: Number of hashed columns
+        norm: Row normalization of the output ('l1', 'l2', 'max' or None)
+        smooth_idf: Add one to document counts, as if one extra document held every term
+        sublinear_tf: Replace tf with 1 + log(tf)
+        binary: Count each term at most once per document
+        dtype: Dtype of the output matrices
+        **hashing_kwargs: Tokenization options passed to HashingVectorizer
+            (lowercase, token_pattern, ngram_range, stop_words, ...)
+    """
+
+    def __init__(self, n_features=2 ** 20, norm='l2', smooth_idf=True, sublinear_tf=False,
+                 binary=False, dtype=np.float32, **hashing_kwargs):
+        self.n_features = n_features
+        self.norm = norm
+        self.smooth_idf = smooth_idf
+        self.sublinear_tf = sublinear_tf
+        self.dtype = dtype
+        self.hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                                        binary=binary, dtype=dtype, **hashing_kwargs)
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+
+    def partial_fit(self, documents):
+        """Add the document frequencies of one chunk of documents"""
+        counts = self.hasher.transform(documents)
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+        return self
+
+    def fit(self, chunks):
+        """Accumulate document frequencies over an iterable of document chunks"""
+        for documents in chunks:
+            self.partial_fit(documents)
+        return self
+
+    @property
+    def idf_(self):
+        df = self.document_frequency
+        n = self.n_documents
+        if self.smooth_idf:
+            df, n = df + 1, n + 1
+        with np.errstate(divide='ignore'):
+            # Columns no document has hit get an infinite idf, but they are never nonzero
+            return (np.log(n / df) + 1).astype(self.dtype)
+
+    def counts(self, documents):
+        """Hashed term counts of a chunk, as CSR"""
+        return self.hasher.transform(documents)
+
+    def _weight(self, matrix, idf):
+        if self.sublinear_tf:
+            np.log(matrix.data, out=matrix.data)
+            matrix.data += 1
+        matrix.data *= idf[matrix.indices]
+        if self.norm is not None:
+            normalize_rows(matrix, self.norm)
+        return matrix
+
+    def transform(self, documents):
+        """TF-IDF rows for one chunk of documents, using the frequencies fitted so far"""
+        return self._weight(self.hasher.transform(documents), self.idf_)
+
+    def transform_iter(self, chunks):
+        """Second streaming pass: one TF-IDF block per chunk"""
+        idf = self.idf_
+        for documents in chunks:
+            yield self._weight(self.hasher.transform(documents), idf)
+
+    def columns(self, terms):
+        """Hashed column of each term, for comparing with a vocabulary-based vectorizer"""
+        return self.hasher.transform(terms).indices